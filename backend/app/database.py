@@ -1,6 +1,8 @@
 """
 Database connection and session management.
 """
+import asyncio
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
@@ -12,13 +14,31 @@ is_sqlite = settings.database_url.startswith("sqlite")
 
 # Create async engine with appropriate settings
 engine_kwargs = {
-    "echo": settings.debug,
+    "echo": settings.db_echo,
     "future": True,
 }
 
 # SQLite needs special handling
 if is_sqlite:
     engine_kwargs["connect_args"] = {"check_same_thread": False}
+else:
+    # Size the pool for concurrent requests instead of the 5 + 10 default
+    engine_kwargs.update({
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    })
+
+# asyncpg: disable JIT planning for our short queries and keep more
+# prepared statements cached per connection
+if settings.database_url.startswith("postgresql+asyncpg"):
+    engine_kwargs["connect_args"] = {
+        "server_settings": {"jit": "off", "application_name": "focustube"},
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 256,
+    }
 
 engine = create_async_engine(settings.database_url, **engine_kwargs)
 
@@ -35,20 +55,53 @@ class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncSession:
-    """Dependency to get database session."""
+async def get_db_readonly() -> AsyncSession:
+    """Dependency to get a database session without committing on exit.
+    
+    For read-only endpoints; saves the COMMIT round-trip per request.
+    """
     async with async_session_maker() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+        yield session
+
+
+async def get_db(session: AsyncSession = Depends(get_db_readonly)) -> AsyncSession:
+    """Dependency to get database session, committed when the request succeeds.
+    
+    Shares the request's read-only session (FastAPI caches dependencies per
+    request), so auth lookups and writes use the same session.
+    """
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+
+async def parallel_queries(*statements) -> list:
+    """Run independent read-only statements concurrently.
+    
+    Each statement gets its own short-lived session (and pooled connection),
+    so the round-trips overlap instead of queuing on a single connection.
+    Returns the fetched rows of each statement, in order.
+    """
+    async def run(statement):
+        async with async_session_maker() as session:
+            result = await session.execute(statement)
+            return result.all()
+    
+    return await asyncio.gather(*(run(statement) for statement in statements))
 
 
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+if __name__ == "__main__":
+    # One-shot schema setup for deployments: python -m app.database
+    # Models register on the importable app.database module, not __main__
+    import app.models  # noqa: F401
+    from app.database import init_db as create_tables
+    asyncio.run(create_tables())
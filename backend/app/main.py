@@ -2,12 +2,15 @@
 FastAPI application entry point.
 """
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import get_settings
 from app.database import init_db
 from app.routers import auth, modes, feed, filter, analytics, suggestions
+from app.services.watch_events import watch_event_buffer
+from app.services.youtube_service import get_youtube_service
 
 settings = get_settings()
 
@@ -15,11 +18,16 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
-    # Startup
-    await init_db()
+    # Startup - only create tables on the fly for local development;
+    # production schemas are created once via `python -m app.database`
+    if settings.debug:
+        await init_db()
+    watch_event_buffer.start()
     yield
     # Shutdown
-    pass
+    await watch_event_buffer.stop()
+    await auth.http_client.aclose()
+    await get_youtube_service().aclose()
 
 
 # Create FastAPI app
@@ -28,6 +36,7 @@ app = FastAPI(
     description="AI-Powered YouTube content filtering and focus management",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -58,4 +67,5 @@ app.include_router(suggestions.router, prefix="/api/suggestions", tags=["Suggest
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvicorn[standard] ships uvloop; loop="auto" runs on it wherever it is available
+    uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True, loop="auto")
@@ -1,7 +1,8 @@
 """Content Cache database model."""
 from datetime import datetime, timedelta
-from sqlalchemy import String, DateTime, Boolean, Integer, Float, JSON, Text
+from sqlalchemy import String, DateTime, Boolean, Integer, Float, JSON, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.ext.hybrid import hybrid_property
 
 from app.database import Base
 
@@ -46,12 +47,33 @@ class ContentCache(Base):
     
     # Timestamps
     published_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
-    analyzed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    analyzed_at: Mapped[datetime] = mapped_column(DateTime, server_default=text("timezone('utc', now())"))
     expires_at: Mapped[datetime] = mapped_column(DateTime, default=default_expiry)
     
+    @hybrid_property
     def is_expired(self) -> bool:
         """Check if cache entry has expired."""
         return datetime.utcnow() > self.expires_at
     
+    @is_expired.expression
+    def is_expired(cls):
+        """SQL form of is_expired, for filtering expired rows in queries."""
+        # expires_at is naive UTC, so compare against the app clock rather
+        # than the database's session-timezone now()
+        return cls.expires_at < datetime.utcnow()
+    
     def __repr__(self):
         return f"<ContentCache {self.video_id}: {self.category}>"
+
+
+# Supports purging and scanning entries by expiry. A partial index on
+# "expires_at > now()" is not possible since now() is not immutable.
+Index("ix_content_cache_expires_at", ContentCache.expires_at)
+
+# Narrow copy of the columns personalization joins on: rows carry long
+# descriptions and transcripts, so joins read this instead of the heap
+Index(
+    "ix_content_cache_video_category",
+    ContentCache.video_id,
+    postgresql_include=["category", "duration_seconds"],
+)
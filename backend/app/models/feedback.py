@@ -1,7 +1,7 @@
 """User Feedback database model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, ForeignKey, Text
+from sqlalchemy import String, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -16,7 +16,7 @@ class UserFeedback(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        server_default=text("gen_random_uuid()")
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
@@ -34,10 +34,18 @@ class UserFeedback(Base):
     # Suggested corrections
     suggested_category: Mapped[str] = mapped_column(String(50), nullable=True)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text("timezone('utc', now())"))
     
     # Relationships
     user = relationship("User", back_populates="feedback")
     
     def __repr__(self):
         return f"<UserFeedback {self.feedback_type} for {self.video_id}>"
+
+
+# Personalization reads a user's recent feedback window
+Index(
+    "ix_user_feedback_user_created",
+    UserFeedback.user_id,
+    UserFeedback.created_at,
+)
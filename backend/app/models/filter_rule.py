@@ -1,7 +1,7 @@
 """Filter Rule database model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, Integer, ForeignKey
+from sqlalchemy import String, DateTime, Boolean, Integer, ForeignKey, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -16,7 +16,7 @@ class FilterRule(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        server_default=text("gen_random_uuid()")
     )
     mode_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
@@ -37,7 +37,7 @@ class FilterRule(Base):
     priority: Mapped[int] = mapped_column(Integer, default=0)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text("timezone('utc', now())"))
     
     # Relationships
     mode = relationship("FocusMode", back_populates="filter_rules")
@@ -1,9 +1,9 @@
 """Focus Mode database model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, Integer, Float, ForeignKey, JSON
+from sqlalchemy import String, DateTime, Boolean, Integer, Float, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from app.database import Base
 
@@ -16,7 +16,7 @@ class FocusMode(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        server_default=text("gen_random_uuid()")
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
@@ -30,12 +30,12 @@ class FocusMode(Base):
     lock_until: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     
     # Category filters
-    allowed_categories: Mapped[list] = mapped_column(JSON, default=list)
-    blocked_categories: Mapped[list] = mapped_column(JSON, default=list)
+    allowed_categories: Mapped[list] = mapped_column(JSONB, default=list)
+    blocked_categories: Mapped[list] = mapped_column(JSONB, default=list)
     
     # Content filters
     min_duration_seconds: Mapped[int] = mapped_column(Integer, default=0)
-    allowed_languages: Mapped[list] = mapped_column(JSON, default=list)
+    allowed_languages: Mapped[list] = mapped_column(JSONB, default=list)
     max_clickbait_score: Mapped[float] = mapped_column(Float, default=1.0)
     max_entertainment_score: Mapped[float] = mapped_column(Float, default=1.0)
     
@@ -47,13 +47,13 @@ class FocusMode(Base):
     daily_time_limit_minutes: Mapped[int] = mapped_column(Integer, nullable=True)
     
     # Keyword blocking
-    blocked_keywords: Mapped[list] = mapped_column(JSON, default=list)
+    blocked_keywords: Mapped[list] = mapped_column(JSONB, default=list)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=text("timezone('utc', now())"))
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, 
-        default=datetime.utcnow,
+        server_default=text("timezone('utc', now())"),
         onupdate=datetime.utcnow
     )
     
@@ -63,3 +63,19 @@ class FocusMode(Base):
     
     def __repr__(self):
         return f"<FocusMode {self.name}>"
+
+
+# Serves the per-request active mode lookup and per-user mode scans
+Index("ix_focus_modes_user_active", FocusMode.user_id, FocusMode.is_active)
+
+# GIN indexes allow containment (@>) checks on the list columns
+Index(
+    "ix_focus_modes_blocked_kw_gin",
+    FocusMode.blocked_keywords,
+    postgresql_using="gin",
+)
+Index(
+    "ix_focus_modes_allowed_cat_gin",
+    FocusMode.allowed_categories,
+    postgresql_using="gin",
+)
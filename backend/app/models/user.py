@@ -1,9 +1,9 @@
 """User database model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, JSON
+from sqlalchemy import String, DateTime, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 
 from app.database import Base
 
@@ -16,20 +16,20 @@ class User(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        server_default=text("gen_random_uuid()")
     )
     email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     google_id: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
     display_name: Mapped[str] = mapped_column(String(255), nullable=True)
     avatar_url: Mapped[str] = mapped_column(String(500), nullable=True)
-    preferences: Mapped[dict] = mapped_column(JSON, default=dict)
+    preferences: Mapped[dict] = mapped_column(JSONB, default=dict)
     created_at: Mapped[datetime] = mapped_column(
         DateTime, 
-        default=datetime.utcnow
+        server_default=text("timezone('utc', now())")
     )
     last_login: Mapped[datetime] = mapped_column(
         DateTime, 
-        default=datetime.utcnow,
+        server_default=text("timezone('utc', now())"),
         onupdate=datetime.utcnow
     )
     
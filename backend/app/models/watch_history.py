@@ -1,7 +1,7 @@
 """Watch History database model."""
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Boolean, Integer, Float, ForeignKey
+from sqlalchemy import String, DateTime, Boolean, Integer, Float, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -16,7 +16,7 @@ class WatchHistory(Base):
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid.uuid4
+        server_default=text("gen_random_uuid()")
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), 
@@ -41,10 +41,20 @@ class WatchHistory(Base):
         nullable=True
     )
     
-    watched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    watched_at: Mapped[datetime] = mapped_column(DateTime, server_default=text("timezone('utc', now())"))
     
     # Relationships
     user = relationship("User", back_populates="watch_history")
     
     def __repr__(self):
         return f"<WatchHistory {self.video_id} by {self.user_id}>"
+
+
+# Analytics queries filter by user and range/order on watched_at; carrying
+# the watch duration lets daily time-limit sums run as index-only scans
+Index(
+    "ix_watch_history_user_watched",
+    WatchHistory.user_id,
+    WatchHistory.watched_at.desc(),
+    postgresql_include=["watch_duration_seconds"],
+)
@@ -1,11 +1,11 @@
 """Analytics router."""
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, func, case
 from typing import List
 from datetime import datetime, timedelta
 
-from app.database import get_db
+from app.database import get_db, get_db_readonly, parallel_queries
 from app.models.user import User
 from app.models.watch_history import WatchHistory
 from app.models.feedback import UserFeedback
@@ -14,6 +14,9 @@ from app.schemas.feedback import (
     WatchHistoryItem, WatchHistoryResponse, AnalyticsSummary, DailyStats
 )
 from app.routers.auth import get_current_user
+from app.services.watch_events import watch_event_buffer
+from app.services.mode_cache import get_active_mode_cached
+from app.services.personalization import invalidate_preferences
 
 router = APIRouter()
 
@@ -21,27 +24,25 @@ router = APIRouter()
 @router.post("/watch", status_code=201)
 async def track_watch(
     event: WatchEvent,
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    user: User = Depends(get_current_user)
 ):
     """Track a watch event."""
     watch_percentage = 0.0
     if event.video_duration_seconds > 0:
         watch_percentage = (event.watch_duration_seconds / event.video_duration_seconds) * 100
     
-    history = WatchHistory(
-        user_id=user.id,
-        video_id=event.video_id,
-        watch_duration_seconds=event.watch_duration_seconds,
-        video_duration_seconds=event.video_duration_seconds,
-        watch_percentage=watch_percentage,
-        was_skipped=event.was_skipped,
-        skip_position_percent=event.skip_position_percent,
-        completed=event.completed,
-        mode_id=event.mode_id,
-    )
-    db.add(history)
-    await db.commit()
+    # Written in batches by the background buffer rather than per request
+    watch_event_buffer.add({
+        "user_id": user.id,
+        "video_id": event.video_id,
+        "watch_duration_seconds": event.watch_duration_seconds,
+        "video_duration_seconds": event.video_duration_seconds,
+        "watch_percentage": watch_percentage,
+        "was_skipped": event.was_skipped,
+        "skip_position_percent": event.skip_position_percent,
+        "completed": event.completed,
+        "mode_id": event.mode_id,
+    })
     
     return {"status": "tracked"}
 
@@ -51,7 +52,7 @@ async def get_history(
     page: int = Query(default=1, ge=1),
     per_page: int = Query(default=20, ge=1, le=100),
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get user's watch history."""
     offset = (page - 1) * per_page
@@ -62,18 +63,26 @@ async def get_history(
     )
     total = count_result.scalar()
     
-    # Get items
+    # Get items - only the columns the response needs, no ORM instances
     result = await db.execute(
-        select(WatchHistory)
+        select(
+            WatchHistory.video_id,
+            WatchHistory.watch_duration_seconds,
+            WatchHistory.watch_percentage,
+            WatchHistory.was_skipped,
+            WatchHistory.completed,
+            WatchHistory.watched_at,
+        )
         .where(WatchHistory.user_id == user.id)
         .order_by(WatchHistory.watched_at.desc())
         .offset(offset)
         .limit(per_page)
     )
-    items = result.scalars().all()
+    items = result.all()
     
+    # Rows come straight from the database, so skip per-item validation
     return WatchHistoryResponse(
-        items=[WatchHistoryItem(
+        items=[WatchHistoryItem.model_construct(
             video_id=h.video_id,
             watch_duration_seconds=h.watch_duration_seconds,
             watch_percentage=h.watch_percentage,
@@ -94,16 +103,21 @@ async def submit_feedback(
     db: AsyncSession = Depends(get_db)
 ):
     """Submit feedback on a video."""
-    feedback = UserFeedback(
-        user_id=user.id,
-        video_id=feedback_data.video_id,
-        feedback_type=feedback_data.feedback_type,
-        reason=feedback_data.reason,
-        suggested_category=feedback_data.suggested_category,
+    # INSERT ... RETURNING hands back the generated id and created_at without a refresh
+    result = await db.execute(
+        insert(UserFeedback)
+        .values(
+            user_id=user.id,
+            video_id=feedback_data.video_id,
+            feedback_type=feedback_data.feedback_type,
+            reason=feedback_data.reason,
+            suggested_category=feedback_data.suggested_category,
+        )
+        .returning(UserFeedback)
     )
-    db.add(feedback)
+    feedback = result.scalar_one()
     await db.commit()
-    await db.refresh(feedback)
+    invalidate_preferences(user.id)
     
     return feedback
 
@@ -111,50 +125,28 @@ async def submit_feedback(
 @router.get("/summary", response_model=AnalyticsSummary)
 async def get_analytics_summary(
     days: int = Query(default=7, ge=1, le=30),
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    user: User = Depends(get_current_user)
 ):
     """Get analytics summary for the user."""
     since = datetime.utcnow() - timedelta(days=days)
     
-    # Get basic watch history stats
-    result = await db.execute(
+    # Watch history stats, including skipped/completed counts
+    stats_query = (
         select(
             func.sum(WatchHistory.watch_duration_seconds).label("total_seconds"),
             func.count().label("total_videos"),
-            func.avg(WatchHistory.watch_percentage).label("avg_percentage")
+            func.avg(WatchHistory.watch_percentage).label("avg_percentage"),
+            func.sum(case((WatchHistory.was_skipped == True, 1), else_=0)).label("skipped"),
+            func.sum(case((WatchHistory.completed == True, 1), else_=0)).label("completed")
         )
         .where(
             WatchHistory.user_id == user.id,
             WatchHistory.watched_at >= since
         )
     )
-    stats = result.first()
     
-    # Count skipped videos separately
-    skipped_result = await db.execute(
-        select(func.count())
-        .where(
-            WatchHistory.user_id == user.id,
-            WatchHistory.watched_at >= since,
-            WatchHistory.was_skipped == True
-        )
-    )
-    skipped_count = skipped_result.scalar() or 0
-    
-    # Count completed videos separately
-    completed_result = await db.execute(
-        select(func.count())
-        .where(
-            WatchHistory.user_id == user.id,
-            WatchHistory.watched_at >= since,
-            WatchHistory.completed == True
-        )
-    )
-    completed_count = completed_result.scalar() or 0
-    
-    # Get daily usage for chart
-    daily_result = await db.execute(
+    # Daily usage for chart
+    daily_query = (
         select(
             func.date(WatchHistory.watched_at).label("watch_date"),
             func.sum(WatchHistory.watch_duration_seconds).label("daily_seconds")
@@ -166,7 +158,10 @@ async def get_analytics_summary(
         .group_by(func.date(WatchHistory.watched_at))
         .order_by(func.date(WatchHistory.watched_at))
     )
-    daily_rows = daily_result.all()
+    
+    # Independent aggregates: overlap their round-trips on separate connections
+    stats_rows, daily_rows = await parallel_queries(stats_query, daily_query)
+    stats = stats_rows[0]
     daily_usage = [
         {"date": str(row.watch_date), "minutes": int((row.daily_seconds or 0) / 60)}
         for row in daily_rows
@@ -175,8 +170,8 @@ async def get_analytics_summary(
     return AnalyticsSummary(
         total_watch_time_minutes=int((stats.total_seconds or 0) / 60),
         videos_watched=stats.total_videos or 0,
-        videos_skipped=skipped_count,
-        videos_completed=completed_count,
+        videos_skipped=int(stats.skipped or 0),
+        videos_completed=int(stats.completed or 0),
         average_watch_percentage=float(stats.avg_percentage or 0),
         top_categories=[],  # Would require joining with content cache
         daily_usage=daily_usage,
@@ -187,7 +182,7 @@ async def get_analytics_summary(
 @router.get("/daily", response_model=DailyStats)
 async def get_daily_stats(
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get today's usage statistics."""
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -205,14 +200,7 @@ async def get_daily_stats(
     stats = result.first()
     
     # Get active mode time limit
-    from app.models.focus_mode import FocusMode
-    mode_result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.user_id == user.id,
-            FocusMode.is_active == True
-        )
-    )
-    active_mode = mode_result.scalar_one_or_none()
+    active_mode = await get_active_mode_cached(user.id, db)
     
     time_limit = active_mode.daily_time_limit_minutes if active_mode else None
     watch_minutes = int((stats.total_seconds or 0) / 60)
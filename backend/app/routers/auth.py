@@ -4,12 +4,17 @@ from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import datetime, timedelta
+from datetime import datetime
 from jose import jwt, JWTError
+from collections import OrderedDict
 import httpx
-from typing import Optional
+import re
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote, urlencode
 
-from app.database import get_db
+from app.database import get_db, get_db_readonly
 from app.config import get_settings
 from app.models.user import User
 from app.schemas.auth import GoogleAuthRequest, TokenResponse, UserResponse, UserWithToken
@@ -19,10 +24,42 @@ settings = get_settings()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
+# Shared client so Google OAuth calls reuse pooled TLS connections.
+# Closed by the application lifespan handler.
+http_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+# Google OAuth consent URL - settings are fixed after startup, so build it once
+GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth?" + urlencode({
+    "client_id": settings.google_client_id,
+    "redirect_uri": settings.google_redirect_uri,
+    "response_type": "code",
+    "scope": "openid email profile https://www.googleapis.com/auth/youtube.readonly",
+    "access_type": "offline",
+    "prompt": "consent",
+}, quote_via=quote)
+
+# Recently decoded tokens: token -> (user_id, token expiry, cached at)
+TOKEN_CACHE_TTL_SECONDS = 30
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: "OrderedDict[str, Tuple[uuid.UUID, float, float]]" = OrderedDict()
+
+# Logged-out tokens: token -> its expiry; entries are dropped once the token
+# would have expired anyway
+_token_denylist: Dict[str, float] = {}
+
+# Canonical form produced by str(uuid.UUID), as issued in the "sub" claim
+_UUID_MATCH = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+).match
+
 
 def create_access_token(user_id: str) -> TokenResponse:
     """Create JWT access token."""
-    expires = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
+    # Unix timestamp; avoids datetime conversion inside jose
+    expires = int(time.time()) + settings.jwt_expire_minutes * 60
     payload = {
         "sub": user_id,
         "exp": expires,
@@ -34,39 +71,92 @@ def create_access_token(user_id: str) -> TokenResponse:
     )
 
 
-async def get_current_user(
-    token: Optional[str] = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user from token."""
-    credentials_exception = HTTPException(
+def _decode_token(token: str) -> Optional[uuid.UUID]:
+    """Decode a JWT to its user id, reusing recent results for the same token.
+    
+    Returns None if the token is invalid or expired.
+    """
+    now = time.time()
+    
+    if token in _token_denylist:
+        return None
+    
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_uuid, expires_at, cached_at = cached
+        if now - cached_at < TOKEN_CACHE_TTL_SECONDS and now < expires_at:
+            _token_cache.move_to_end(token)
+            return user_uuid
+        del _token_cache[token]
+    
+    try:
+        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return None
+    
+    user_id = payload.get("sub")
+    if not isinstance(user_id, str) or not _UUID_MATCH(user_id):
+        return None
+    user_uuid = uuid.UUID(user_id)
+    
+    _token_cache[token] = (user_uuid, float(payload.get("exp", 0)), now)
+    if len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+        _token_cache.popitem(last=False)
+    
+    return user_uuid
+
+
+def _revoke_token(token: str) -> None:
+    """Deny a token until it expires and forget its cached claims."""
+    _token_cache.pop(token, None)
+    try:
+        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return  # Invalid or already expired: nothing to deny
+    
+    now = time.time()
+    for denied, expires_at in list(_token_denylist.items()):
+        if expires_at <= now:
+            del _token_denylist[denied]
+    _token_denylist[token] = float(payload.get("exp", 0))
+
+
+def _credentials_exception() -> HTTPException:
+    """401 raised for a missing, invalid or expired token."""
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+async def get_current_user_id(
+    token: Optional[str] = Depends(oauth2_scheme)
+) -> uuid.UUID:
+    """Get the authenticated user's id from the token alone.
     
+    For endpoints that only need a signed-in caller: no session is
+    checked out and the user row is not loaded.
+    """
     if token is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
-    try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-        # Convert string to UUID
-        import uuid as uuid_module
-        user_uuid = uuid_module.UUID(user_id)
-    except JWTError:
-        raise credentials_exception
-    except ValueError:
-        # Invalid UUID format
-        raise credentials_exception
+    user_uuid = _decode_token(token)
+    if user_uuid is None:
+        raise _credentials_exception()
     
-    result = await db.execute(select(User).where(User.id == user_uuid))
-    user = result.scalar_one_or_none()
+    return user_uuid
+
+
+async def get_current_user(
+    user_uuid: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db_readonly)
+) -> User:
+    """Get current authenticated user from token."""
+    user = await db.get(User, user_uuid)
     
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     return user
 
@@ -74,56 +164,47 @@ async def get_current_user(
 @router.get("/google")
 async def google_auth_redirect():
     """Redirect to Google OAuth consent screen."""
-    google_auth_url = (
-        "https://accounts.google.com/o/oauth2/v2/auth?"
-        f"client_id={settings.google_client_id}&"
-        f"redirect_uri={settings.google_redirect_uri}&"
-        "response_type=code&"
-        "scope=openid%20email%20profile%20https://www.googleapis.com/auth/youtube.readonly&"
-        "access_type=offline&"
-        "prompt=consent"
-    )
-    return RedirectResponse(url=google_auth_url)
+    return RedirectResponse(url=GOOGLE_AUTH_URL)
 
 
 @router.get("/callback")
 async def google_callback(code: str, db: AsyncSession = Depends(get_db)):
     """Handle Google OAuth callback."""
-    # Exchange code for tokens
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "code": code,
-                "client_id": settings.google_client_id,
-                "client_secret": settings.google_client_secret,
-                "redirect_uri": settings.google_redirect_uri,
-                "grant_type": "authorization_code",
-            }
+    # Exchange code for tokens (userinfo needs the resulting access token,
+    # so the two calls are inherently sequential)
+    token_response = await http_client.post(
+        "https://oauth2.googleapis.com/token",
+        data={
+            "code": code,
+            "client_id": settings.google_client_id,
+            "client_secret": settings.google_client_secret,
+            "redirect_uri": settings.google_redirect_uri,
+            "grant_type": "authorization_code",
+        }
+    )
+    
+    if token_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to exchange code for tokens"
         )
-        
-        if token_response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to exchange code for tokens"
-            )
-        
-        tokens = token_response.json()
-        access_token = tokens.get("access_token")
-        
-        # Get user info
-        user_response = await client.get(
-            "https://www.googleapis.com/oauth2/v2/userinfo",
-            headers={"Authorization": f"Bearer {access_token}"}
+    
+    tokens = token_response.json()
+    access_token = tokens.get("access_token")
+    
+    # Get user info
+    user_response = await http_client.get(
+        "https://www.googleapis.com/oauth2/v2/userinfo",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+    
+    if user_response.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to get user info"
         )
-        
-        if user_response.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to get user info"
-            )
-        
-        user_info = user_response.json()
+    
+    user_info = user_response.json()
     
     # Find or create user
     result = await db.execute(
@@ -161,8 +242,10 @@ async def refresh_token(user: User = Depends(get_current_user)):
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (client should discard token)."""
+async def logout(token: Optional[str] = Depends(oauth2_scheme)):
+    """Logout user, revoking the token for the rest of its lifetime."""
+    if token is not None:
+        _revoke_token(token)
     return {"message": "Logged out successfully"}
 
 
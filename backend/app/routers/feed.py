@@ -1,39 +1,126 @@
 """Feed router - Uses real YouTube API with demo data fallback."""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import random
 import time
 
-from app.database import get_db
+from app.database import get_db, get_db_readonly, async_session_maker
 from app.models.user import User
-from app.models.focus_mode import FocusMode
-from app.schemas.video import FeedResponse, FeedItem, VideoResponse
+from app.schemas.video import FeedResponse, FeedItem, VideoResponse, VideoClassification
 from app.routers.auth import get_current_user
-from app.services.youtube_service import YouTubeService
-from app.services.ai_classifier import AIClassifier
-from app.services.filter_engine import FilterEngine
+from app.services.youtube_service import YouTubeService, get_youtube_service
+from app.services.ai_classifier import AIClassifier, get_ai_classifier
+from app.services.filter_engine import ALLOWED, FilterEngine
+from app.services.mode_cache import get_active_mode_cached
 from app.services.demo_data import get_demo_videos, generate_dynamic_videos
 
 router = APIRouter()
 
+# Next-page YouTube fetches started while the client renders the current page
+PREFETCH_TTL_SECONDS = 60
+_prefetched: Dict[str, Tuple[asyncio.Task, float]] = {}
+
+# Videos classified per step of the streaming feed
+STREAM_BATCH_SIZE = 4
+
+# Validates a whole page of demo feed items in one pydantic-core call
+_FEED_ITEMS = TypeAdapter(List[FeedItem])
+
+
+def _take_prefetched(key: str) -> Optional[asyncio.Task]:
+    """Claim a prefetched page if it is still fresh."""
+    entry = _prefetched.pop(key, None)
+    if not entry:
+        return None
+    task, started_at = entry
+    if time.monotonic() - started_at >= PREFETCH_TTL_SECONDS:
+        task.cancel()
+        return None
+    return task
+
+
+def _schedule_prefetch(key: str, coro) -> None:
+    """Start fetching a page in the background and remember it under key."""
+    now = time.monotonic()
+    # Drop abandoned prefetches so the map does not grow unbounded
+    for stale_key, (task, started_at) in list(_prefetched.items()):
+        if now - started_at >= PREFETCH_TTL_SECONDS:
+            task.cancel()
+            del _prefetched[stale_key]
+    
+    task = asyncio.create_task(coro)
+    # Mark failures as retrieved; the claiming request re-raises them
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _prefetched[key] = (task, now)
+
+
+def _to_feed_item(video: Dict, classification: VideoClassification) -> FeedItem:
+    """Build a feed item from a YouTube video and its classification.
+    
+    Skips validation: the fields come from our own YouTube parser and
+    classifier, already in the schema's types.
+    """
+    return FeedItem.model_construct(
+        video_id=video["id"],
+        title=video["title"],
+        channel_title=video.get("channel_title"),
+        thumbnail_url=video.get("thumbnail_url"),
+        duration_seconds=video.get("duration_seconds", 0),
+        is_short=video.get("is_short", False),
+        view_count=video.get("view_count", 0),
+        published_at=video.get("published_at"),
+        category=classification.category,
+        clickbait_score=classification.clickbait_score,
+        entertainment_score=classification.entertainment_score,
+    )
+
+
+def _sse(event: str, data: str) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _fetch_feed_page(
+    youtube_service: YouTubeService,
+    categories: Optional[List[str]],
+    min_duration_seconds: int,
+    max_results: int,
+    page_token: Optional[str]
+) -> Dict:
+    """Fetch one page of raw videos for a mode's allowed categories."""
+    if categories:
+        # Use categories as search terms to get relevant content
+        search_query = " ".join(categories[:2])
+        return await youtube_service.search_videos(
+            query=search_query,
+            max_results=max_results * 2,  # Fetch more to account for filtering
+            page_token=page_token,
+            **youtube_service.search_filters(min_duration_seconds)
+        )
+    # Get recommended/trending videos
+    return await youtube_service.get_recommended_videos(
+        max_results=max_results * 2,
+        page_token=page_token
+    )
+
 
 @router.get("", response_model=FeedResponse)
 async def get_feed(
     max_results: int = Query(default=20, ge=1, le=50),
     page_token: Optional[str] = None,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    youtube_service: YouTubeService = Depends(get_youtube_service),
+    ai_classifier: AIClassifier = Depends(get_ai_classifier)
 ):
     """Get filtered feed based on active focus mode using real YouTube API."""
     # Get active mode
-    result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.user_id == user.id,
-            FocusMode.is_active == True
-        )
-    )
-    active_mode = result.scalar_one_or_none()
+    active_mode = await get_active_mode_cached(user.id, db)
     
     if not active_mode:
         raise HTTPException(
@@ -41,9 +128,6 @@ async def get_feed(
             detail="No active focus mode. Please activate a mode first."
         )
     
-    # Initialize services
-    youtube_service = YouTubeService()
-    ai_classifier = AIClassifier()
     filter_engine = FilterEngine(active_mode)
     
     use_demo_data = False
@@ -51,28 +135,39 @@ async def get_feed(
     next_page_token = None
     
     # Fetch videos from YouTube API
+    key_prefix = f"feed:{user.id}:{active_mode.id}:{max_results}"
     try:
-        if active_mode.allowed_categories:
-            # Use categories as search terms to get relevant content
-            search_query = " ".join(active_mode.allowed_categories[:2])
-            videos = await youtube_service.search_videos(
-                query=search_query,
-                max_results=max_results * 2,  # Fetch more to account for filtering
-                page_token=page_token
-            )
+        prefetched = _take_prefetched(f"{key_prefix}:{page_token}")
+        if prefetched:
+            videos = await prefetched
         else:
-            # Get recommended/trending videos
-            videos = await youtube_service.get_recommended_videos(
-                max_results=max_results * 2,
-                page_token=page_token
+            videos = await _fetch_feed_page(
+                youtube_service,
+                active_mode.allowed_categories,
+                active_mode.min_duration_seconds,
+                max_results,
+                page_token
             )
-            
+        
         # Check if API returned an error
         if "error" in videos:
             use_demo_data = True
         else:
             next_page_token = videos.get("next_page_token")
-            
+            next_key = f"{key_prefix}:{next_page_token}"
+            # A reload of this page must not start a second fetch of the next one
+            if next_page_token and next_key not in _prefetched:
+                _schedule_prefetch(
+                    next_key,
+                    _fetch_feed_page(
+                        youtube_service,
+                        active_mode.allowed_categories,
+                        active_mode.min_duration_seconds,
+                        max_results,
+                        next_page_token
+                    )
+                )
+    
     except Exception as e:
         use_demo_data = True
     
@@ -104,43 +199,25 @@ async def get_feed(
         
         # Combine and shuffle
         all_videos = demo_videos + dynamic_videos
-        import random
-        random.seed(seed + page_num)
-        random.shuffle(all_videos)
+        random.Random(seed + page_num).shuffle(all_videos)
         
         # For demo data, skip classification and use pre-assigned categories
         filtered_items = []
         filtered_count = 0
         
+        # Mode rules compiled once into a single category/duration/shorts test
+        passes_filter = filter_engine.compile_fast_predicate()
+        
         for video in all_videos:
-            # Demo videos already have a category assigned based on their source
-            video_category = video.get("category", "ENTERTAINMENT")
-            
-            # Quick check: is this category allowed in the current mode?
-            if active_mode.allowed_categories:
-                if video_category not in active_mode.allowed_categories:
-                    filtered_count += 1
-                    continue
-            
-            # Check blocked categories
-            if active_mode.blocked_categories:
-                if video_category in active_mode.blocked_categories:
-                    filtered_count += 1
-                    continue
-            
-            # Check duration
-            duration = video.get("duration_seconds", 0)
-            if duration < active_mode.min_duration_seconds:
+            if not passes_filter(video):
                 filtered_count += 1
                 continue
             
-            # Check shorts
-            if active_mode.block_shorts and video.get("is_short", False):
-                filtered_count += 1
-                continue
+            # Demo videos already have a category assigned based on their source
+            video_category = video.get("category", "ENTERTAINMENT")
             
             # Passed all checks - add to results
-            filtered_items.append(FeedItem(
+            filtered_items.append(dict(
                 video_id=video["id"],
                 title=video["title"],
                 channel_title=video.get("channel_title"),
@@ -160,7 +237,7 @@ async def get_feed(
         next_page_token = str(page_num + 1)
         
         return FeedResponse(
-            items=filtered_items,
+            items=_FEED_ITEMS.validate_python(filtered_items),
             next_page_token=next_page_token,
             total_results=len(filtered_items) + filtered_count,
             filtered_count=filtered_count
@@ -170,27 +247,16 @@ async def get_feed(
     filtered_items = []
     filtered_count = 0
     
-    for video in videos.get("items", []):
-        # Classify video with AI
-        classification = await ai_classifier.classify_video(video, db)
-        
-        # Apply focus mode filters
-        filter_result = filter_engine.check_video(video, classification)
-        
-        if filter_result["allowed"]:
-            filtered_items.append(FeedItem(
-                video_id=video["id"],
-                title=video["title"],
-                channel_title=video.get("channel_title"),
-                thumbnail_url=video.get("thumbnail_url"),
-                duration_seconds=video.get("duration_seconds", 0),
-                is_short=video.get("is_short", False),
-                view_count=video.get("view_count", 0),
-                published_at=video.get("published_at"),
-                category=classification.category,
-                clickbait_score=classification.clickbait_score,
-                entertainment_score=classification.entertainment_score,
-            ))
+    # Classify the whole page in one pass
+    items = videos.get("items", [])
+    classifications = await ai_classifier.classify_batch(items, db)
+    
+    # Apply focus mode filters to the whole page at once
+    reason_codes = filter_engine.check_batch(items, classifications)
+    
+    for video, classification, reason_code in zip(items, classifications, reason_codes):
+        if reason_code == ALLOWED:
+            filtered_items.append(_to_feed_item(video, classification))
             
             if len(filtered_items) >= max_results:
                 break
@@ -211,17 +277,13 @@ async def search_feed(
     max_results: int = Query(default=20, ge=1, le=50),
     page_token: Optional[str] = None,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    youtube_service: YouTubeService = Depends(get_youtube_service),
+    ai_classifier: AIClassifier = Depends(get_ai_classifier)
 ):
     """Search videos with filters applied based on active focus mode."""
     # Get active mode
-    result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.user_id == user.id,
-            FocusMode.is_active == True
-        )
-    )
-    active_mode = result.scalar_one_or_none()
+    active_mode = await get_active_mode_cached(user.id, db)
     
     if not active_mode:
         raise HTTPException(
@@ -229,18 +291,21 @@ async def search_feed(
             detail="No active focus mode. Please activate a mode first."
         )
     
-    # Initialize services
-    youtube_service = YouTubeService()
-    ai_classifier = AIClassifier()
     filter_engine = FilterEngine(active_mode)
     
     # Search videos from YouTube API
+    # Search pages are the same for every user, so prefetches are shared too
+    key_prefix = f"search:{max_results}:{query}"
     try:
-        videos = await youtube_service.search_videos(
-            query=query,
-            max_results=max_results * 2,
-            page_token=page_token
-        )
+        prefetched = _take_prefetched(f"{key_prefix}:{page_token}")
+        if prefetched:
+            videos = await prefetched
+        else:
+            videos = await youtube_service.search_videos(
+                query=query,
+                max_results=max_results * 2,
+                page_token=page_token
+            )
         
         if "error" in videos:
             error_msg = videos.get("error", {})
@@ -248,7 +313,20 @@ async def search_feed(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=f"YouTube API error: {error_msg.get('message', 'Unknown error')}"
             )
-            
+        
+        # Warm the next page while the client renders this one
+        next_page_token = videos.get("next_page_token")
+        next_key = f"{key_prefix}:{next_page_token}"
+        if next_page_token and next_key not in _prefetched:
+            _schedule_prefetch(
+                next_key,
+                youtube_service.search_videos(
+                    query=query,
+                    max_results=max_results * 2,
+                    page_token=next_page_token
+                )
+            )
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -261,24 +339,13 @@ async def search_feed(
     filtered_items = []
     filtered_count = 0
     
-    for video in videos.get("items", []):
-        classification = await ai_classifier.classify_video(video, db)
-        filter_result = filter_engine.check_video(video, classification)
-        
-        if filter_result["allowed"]:
-            filtered_items.append(FeedItem(
-                video_id=video["id"],
-                title=video["title"],
-                channel_title=video.get("channel_title"),
-                thumbnail_url=video.get("thumbnail_url"),
-                duration_seconds=video.get("duration_seconds", 0),
-                is_short=video.get("is_short", False),
-                view_count=video.get("view_count", 0),
-                published_at=video.get("published_at"),
-                category=classification.category,
-                clickbait_score=classification.clickbait_score,
-                entertainment_score=classification.entertainment_score,
-            ))
+    items = videos.get("items", [])
+    classifications = await ai_classifier.classify_batch(items, db)
+    reason_codes = filter_engine.check_batch(items, classifications)
+    
+    for video, classification, reason_code in zip(items, classifications, reason_codes):
+        if reason_code == ALLOWED:
+            filtered_items.append(_to_feed_item(video, classification))
             
             if len(filtered_items) >= max_results:
                 break
@@ -293,25 +360,96 @@ async def search_feed(
     )
 
 
+@router.get("/stream")
+async def stream_feed(
+    max_results: int = Query(default=20, ge=1, le=50),
+    page_token: Optional[str] = None,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_readonly),
+    youtube_service: YouTubeService = Depends(get_youtube_service),
+    ai_classifier: AIClassifier = Depends(get_ai_classifier)
+):
+    """Stream the filtered feed as server-sent events.
+    
+    Emits an "item" event per video as soon as its mini-batch is classified,
+    then a "done" event carrying next_page_token and filtered_count.
+    """
+    # Get active mode
+    active_mode = await get_active_mode_cached(user.id, db)
+    
+    if not active_mode:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No active focus mode. Please activate a mode first."
+        )
+    
+    filter_engine = FilterEngine(active_mode)
+    
+    try:
+        videos = await _fetch_feed_page(
+            youtube_service,
+            active_mode.allowed_categories,
+            active_mode.min_duration_seconds,
+            max_results,
+            page_token
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to fetch videos: {str(e)}"
+        )
+    
+    if "error" in videos:
+        error_msg = videos.get("error", {})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"YouTube API error: {error_msg.get('message', 'Unknown error')}"
+        )
+    
+    items = videos.get("items", [])
+    
+    async def events():
+        sent = 0
+        filtered_count = 0
+        # The request session is closed before streaming starts, so use our own
+        async with async_session_maker() as session:
+            for start in range(0, len(items), STREAM_BATCH_SIZE):
+                batch = items[start:start + STREAM_BATCH_SIZE]
+                classifications = await ai_classifier.classify_batch(batch, session)
+                
+                reason_codes = filter_engine.check_batch(batch, classifications)
+                
+                for video, classification, reason_code in zip(batch, classifications, reason_codes):
+                    if reason_code != ALLOWED:
+                        filtered_count += 1
+                        continue
+                    yield _sse("item", _to_feed_item(video, classification).model_dump_json())
+                    sent += 1
+                    if sent >= max_results:
+                        break
+                
+                if sent >= max_results:
+                    break
+        
+        yield _sse("done", json.dumps({
+            "next_page_token": videos.get("next_page_token"),
+            "filtered_count": filtered_count,
+        }))
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 @router.get("/video/{video_id}", response_model=VideoResponse)
 async def get_video(
     video_id: str,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    youtube_service: YouTubeService = Depends(get_youtube_service),
+    ai_classifier: AIClassifier = Depends(get_ai_classifier)
 ):
     """Get video details with AI classification and filter status."""
     # Get active mode
-    result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.user_id == user.id,
-            FocusMode.is_active == True
-        )
-    )
-    active_mode = result.scalar_one_or_none()
-    
-    # Initialize services
-    youtube_service = YouTubeService()
-    ai_classifier = AIClassifier()
+    active_mode = await get_active_mode_cached(user.id, db)
     
     # Fetch video details from YouTube
     video = await youtube_service.get_video_details(video_id)
@@ -1,16 +1,15 @@
 """Filter router."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.database import get_db
 from app.models.user import User
-from app.models.focus_mode import FocusMode
 from app.schemas.video import FilterCheckRequest, FilterCheckResponse
 from app.routers.auth import get_current_user
-from app.services.youtube_service import YouTubeService
-from app.services.ai_classifier import AIClassifier
+from app.services.youtube_service import YouTubeService, get_youtube_service
+from app.services.ai_classifier import AIClassifier, get_ai_classifier
 from app.services.filter_engine import FilterEngine
+from app.services.mode_cache import get_active_mode_cached
 
 router = APIRouter()
 
@@ -19,17 +18,13 @@ router = APIRouter()
 async def check_filter(
     request: FilterCheckRequest,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    youtube_service: YouTubeService = Depends(get_youtube_service),
+    ai_classifier: AIClassifier = Depends(get_ai_classifier)
 ):
     """Check if a video passes the current focus mode filters."""
     # Get active mode
-    result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.user_id == user.id,
-            FocusMode.is_active == True
-        )
-    )
-    active_mode = result.scalar_one_or_none()
+    active_mode = await get_active_mode_cached(user.id, db)
     
     if not active_mode:
         raise HTTPException(
@@ -37,9 +32,6 @@ async def check_filter(
             detail="No active focus mode"
         )
     
-    # Initialize services
-    youtube_service = YouTubeService()
-    ai_classifier = AIClassifier()
     filter_engine = FilterEngine(active_mode)
     
     # Fetch video
@@ -1,12 +1,13 @@
 """Focus Modes router."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, insert, update, delete
+from typing import Any, Dict, List, Tuple
+from types import MappingProxyType
 from uuid import UUID
 from datetime import datetime, timedelta
 
-from app.database import get_db
+from app.database import get_db, get_db_readonly
 from app.models.user import User
 from app.models.focus_mode import FocusMode
 from app.models.filter_rule import FilterRule
@@ -15,12 +16,13 @@ from app.schemas.mode import (
     LockSessionRequest, FilterRuleCreate, FilterRuleResponse
 )
 from app.routers.auth import get_current_user
+from app.services.mode_cache import invalidate_active_mode
 
 router = APIRouter()
 
 
-# Preset focus modes with all YouTube categories
-PRESET_MODES = {
+# Preset focus modes with all YouTube categories (read-only)
+PRESET_MODES = MappingProxyType({
     "study": {
         "name": "Study Mode",
         "description": "Focus on educational content only",
@@ -123,7 +125,25 @@ PRESET_MODES = {
         "block_shorts": True,
         "block_trending": False,
     },
-}
+})
+
+# Preset INSERT rows, normalized to the same columns once at import;
+# list values are frozen to tuples so requests can share them safely
+_PRESET_ROWS: Tuple[Dict[str, Any], ...] = tuple(
+    {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in FocusModeCreate(**preset_data).model_dump().items()
+    }
+    for preset_data in PRESET_MODES.values()
+)
+
+
+def _preset_rows(user_id: UUID, activate_first: bool = False) -> List[dict]:
+    """Build one INSERT row per preset, all with the same columns."""
+    return [
+        {"user_id": user_id, "is_active": activate_first and i == 0, **row}
+        for i, row in enumerate(_PRESET_ROWS)
+    ]
 
 
 @router.get("", response_model=List[FocusModeResponse])
@@ -139,15 +159,11 @@ async def list_modes(
     
     # Create preset modes if user has none
     if not modes:
-        for preset_key, preset_data in PRESET_MODES.items():
-            mode = FocusMode(user_id=user.id, **preset_data)
-            db.add(mode)
-        await db.commit()
-        
         result = await db.execute(
-            select(FocusMode).where(FocusMode.user_id == user.id)
+            insert(FocusMode).values(_preset_rows(user.id)).returning(FocusMode)
         )
         modes = result.scalars().all()
+        await db.commit()
     
     return modes
 
@@ -158,30 +174,19 @@ async def reset_modes(
     db: AsyncSession = Depends(get_db)
 ):
     """Reset all focus modes to default presets. Deletes all existing modes."""
-    # Delete all existing modes for the user
-    result = await db.execute(
-        select(FocusMode).where(FocusMode.user_id == user.id)
-    )
-    existing_modes = result.scalars().all()
-    for mode in existing_modes:
-        await db.delete(mode)
-    await db.commit()
+    # Delete all existing modes for the user (their rules cascade in the database)
+    await db.execute(delete(FocusMode).where(FocusMode.user_id == user.id))
     
-    # Create fresh preset modes
-    new_modes = []
-    first_mode = True
-    for preset_key, preset_data in PRESET_MODES.items():
-        mode = FocusMode(user_id=user.id, is_active=first_mode, **preset_data)
-        db.add(mode)
-        new_modes.append(mode)
-        first_mode = False
-    await db.commit()
-    
-    # Refresh to get IDs
+    # Create fresh preset modes in one INSERT, activating the first one;
+    # RETURNING hands back the new rows without a follow-up SELECT
     result = await db.execute(
-        select(FocusMode).where(FocusMode.user_id == user.id)
+        insert(FocusMode)
+        .values(_preset_rows(user.id, activate_first=True))
+        .returning(FocusMode)
     )
     modes = result.scalars().all()
+    await db.commit()
+    invalidate_active_mode(user.id)
     
     return modes
 
@@ -196,6 +201,7 @@ async def create_mode(
     mode = FocusMode(user_id=user.id, **mode_data.model_dump())
     db.add(mode)
     await db.commit()
+    invalidate_active_mode(user.id)
     await db.refresh(mode)
     return mode
 
@@ -203,7 +209,7 @@ async def create_mode(
 @router.get("/active", response_model=FocusModeResponse)
 async def get_active_mode(
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get the currently active focus mode."""
     result = await db.execute(
@@ -227,7 +233,7 @@ async def get_active_mode(
 async def get_mode(
     mode_id: UUID,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """Get a specific focus mode."""
     result = await db.execute(
@@ -279,6 +285,7 @@ async def update_mode(
         setattr(mode, key, value)
     
     await db.commit()
+    invalidate_active_mode(user.id)
     await db.refresh(mode)
     return mode
 
@@ -306,6 +313,7 @@ async def delete_mode(
     
     await db.delete(mode)
     await db.commit()
+    invalidate_active_mode(user.id)
 
 
 @router.post("/{mode_id}/activate", response_model=FocusModeResponse)
@@ -315,39 +323,25 @@ async def activate_mode(
     db: AsyncSession = Depends(get_db)
 ):
     """Activate a focus mode (deactivates others)."""
-    # Check if any mode is locked
+    # Load the user's modes once; the lock and ownership checks run on this list
     result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.user_id == user.id,
-            FocusMode.is_locked == True
-        )
+        select(FocusMode).where(FocusMode.user_id == user.id)
+    )
+    all_modes = result.scalars().all()
+    
+    now = datetime.utcnow()
+    locked_mode = next(
+        (m for m in all_modes if m.is_locked and m.lock_until and m.lock_until > now),
+        None
     )
-    locked_mode = result.scalar_one_or_none()
     
-    if locked_mode and locked_mode.lock_until and locked_mode.lock_until > datetime.utcnow():
+    if locked_mode:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Cannot change mode: '{locked_mode.name}' is locked until {locked_mode.lock_until}"
         )
     
-    # Deactivate all modes
-    result = await db.execute(
-        select(FocusMode).where(FocusMode.user_id == user.id)
-    )
-    all_modes = result.scalars().all()
-    for m in all_modes:
-        m.is_active = False
-        m.is_locked = False
-        m.lock_until = None
-    
-    # Activate the requested mode
-    result = await db.execute(
-        select(FocusMode).where(
-            FocusMode.id == mode_id,
-            FocusMode.user_id == user.id
-        )
-    )
-    mode = result.scalar_one_or_none()
+    mode = next((m for m in all_modes if m.id == mode_id), None)
     
     if not mode:
         raise HTTPException(
@@ -355,9 +349,20 @@ async def activate_mode(
             detail="Focus mode not found"
         )
     
-    mode.is_active = True
+    # Deactivate all modes, then activate the requested one
+    await db.execute(
+        update(FocusMode)
+        .where(FocusMode.user_id == user.id)
+        .values(is_active=False, is_locked=False, lock_until=None)
+    )
+    await db.execute(
+        update(FocusMode)
+        .where(FocusMode.id == mode.id)
+        .values(is_active=True)
+    )
+    
     await db.commit()
-    await db.refresh(mode)
+    invalidate_active_mode(user.id)
     return mode
 
 
@@ -393,6 +398,7 @@ async def lock_session(
     mode.lock_until = datetime.utcnow() + timedelta(minutes=lock_data.duration_minutes)
     
     await db.commit()
+    invalidate_active_mode(user.id)
     await db.refresh(mode)
     return mode
 
@@ -401,7 +407,7 @@ async def lock_session(
 async def list_mode_rules(
     mode_id: UUID,
     user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_readonly)
 ):
     """List filter rules for a focus mode."""
     # Verify mode ownership
@@ -1,76 +1,154 @@
 """Search suggestions router."""
+import bisect
+from functools import lru_cache
+import uuid
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Dict, List, Tuple
 
-from app.database import get_db
-from app.models.user import User
-from app.routers.auth import get_current_user
+from app.routers.auth import get_current_user_id
 from app.services.youtube_service import YouTubeService
 
 router = APIRouter()
 
+MAX_SUGGESTIONS = 8
+TOKEN_PREFIX_LENGTH = 6  # Longest word prefix kept in the token index
 
-@router.get("", response_model=List[str])
-async def get_suggestions(
-    query: str = Query(..., min_length=1, max_length=100),
-    user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
-):
-    """Get search suggestions based on a query prefix."""
-    # Common search prefixes for the YouTube focus engine context
-    # In production, this would use YouTube's suggestion API or a custom ML model
+# Common search prefixes for the YouTube focus engine context
+# In production, this would use YouTube's suggestion API or a custom ML model
+_SUGGESTIONS: Tuple[str, ...] = (
+    # Educational
+    "python tutorial",
+    "python for beginners",
+    "python crash course",
+    "programming tutorial",
+    "machine learning",
+    "data science",
+    "web development",
+    "react tutorial",
+    "javascript tutorial",
+    "computer science",
+    "coding for beginners",
+    "learn to code",
+    "algorithms explained",
+    "system design",
+    
+    # Music
+    "music playlist",
+    "lofi beats",
+    "study music",
+    "relaxing music",
+    "classical music",
+    "jazz music",
+    "pop music",
+    "workout playlist",
+    
+    # Entertainment
+    "funny videos",
+    "comedy sketches",
+    "stand up comedy",
+    "movie trailers",
+    "gaming highlights",
+    "best moments",
     
-    q = query.lower()
+    # Productivity
+    "productivity tips",
+    "study tips",
+    "how to focus",
+    "time management",
+    "morning routine",
+)
+_SUGGESTIONS_LOWER = tuple(s.lower() for s in _SUGGESTIONS)
+_SUGGESTION_LENGTHS = tuple(len(s) for s in _SUGGESTIONS)
+
+
+class _TrieNode:
+    """Prefix trie node listing every suggestion that passes through it."""
+    
+    __slots__ = ("children", "terminals")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terminals: List[int] = []  # Indices into _SUGGESTIONS, shortest first
+
+
+def _suggestion_rank(index: int) -> Tuple[int, int]:
+    """Shortest suggestions first; ties keep list order."""
+    return _SUGGESTION_LENGTHS[index], index
+
+
+def _build_trie() -> _TrieNode:
+    """Index each lowercased suggestion under every one of its prefixes.
     
-    # Base suggestions for educational/entertainment content
-    base_suggestions = [
-        # Educational
-        "python tutorial",
-        "python for beginners",
-        "python crash course",
-        "programming tutorial",
-        "machine learning",
-        "data science",
-        "web development",
-        "react tutorial",
-        "javascript tutorial",
-        "computer science",
-        "coding for beginners",
-        "learn to code",
-        "algorithms explained",
-        "system design",
-        
-        # Music
-        "music playlist",
-        "lofi beats",
-        "study music",
-        "relaxing music",
-        "classical music",
-        "jazz music",
-        "pop music",
-        "workout playlist",
-        
-        # Entertainment
-        "funny videos",
-        "comedy sketches",
-        "stand up comedy",
-        "movie trailers",
-        "gaming highlights",
-        "best moments",
-        
-        # Productivity
-        "productivity tips",
-        "study tips",
-        "how to focus",
-        "time management",
-        "morning routine",
-    ]
+    Each node keeps only the MAX_SUGGESTIONS best completions, so memory per
+    node stays bounded as the phrase list grows and lookups never sort.
+    """
+    root = _TrieNode()
+    for index, suggestion in enumerate(_SUGGESTIONS_LOWER):
+        rank = _suggestion_rank(index)
+        node = root
+        for char in suggestion:
+            node = node.children.setdefault(char, _TrieNode())
+            terminals = node.terminals
+            if len(terminals) == MAX_SUGGESTIONS:
+                if rank >= _suggestion_rank(terminals[-1]):
+                    continue
+                terminals.pop()
+            bisect.insort(terminals, index, key=_suggestion_rank)
+    return root
+
+
+def _build_token_index() -> Dict[str, List[int]]:
+    """Map each word, and each of its short prefixes, to the suggestions containing it."""
+    index: Dict[str, List[int]] = {}
+    for i, suggestion in enumerate(_SUGGESTIONS_LOWER):
+        for token in suggestion.split():
+            keys = {token[:n] for n in range(1, min(len(token), TOKEN_PREFIX_LENGTH) + 1)}
+            keys.add(token)
+            for key in keys:
+                postings = index.setdefault(key, [])
+                if not postings or postings[-1] != i:
+                    postings.append(i)
     
-    # Filter suggestions that match the query
-    matching = [s for s in base_suggestions if s.startswith(q) or q in s]
+    for postings in index.values():
+        postings.sort(key=_suggestion_rank)
+    return index
+
+
+_ROOT = _build_trie()
+_TOKEN_INDEX = _build_token_index()
+
+
+@lru_cache(maxsize=4096)
+def _match(q: str) -> Tuple[str, ...]:
+    """Suggestions for a lowercased query; shared by every user."""
+    # Prefix matches come straight off the trie node, already ranked and capped
+    node = _ROOT
+    for char in q:
+        node = node.children.get(char)
+        if node is None:
+            break
+    prefix_hits = node.terminals if node is not None else []
+    matching = [_SUGGESTIONS[i] for i in prefix_hits]
     
-    # Sort by relevance (starts with query first)
-    matching.sort(key=lambda x: (0 if x.startswith(q) else 1, len(x)))
+    # Top up with suggestions where a later word starts with the query
+    words = q.split()
+    if len(matching) < MAX_SUGGESTIONS and words:
+        seen = set(prefix_hits)
+        head = words[0]
+        candidates = _TOKEN_INDEX.get(head) or _TOKEN_INDEX.get(head[:TOKEN_PREFIX_LENGTH], ())
+        for i in candidates:
+            if i not in seen and q in _SUGGESTIONS_LOWER[i]:
+                matching.append(_SUGGESTIONS[i])
+                if len(matching) == MAX_SUGGESTIONS:
+                    break
     
-    return matching[:8]  # Return max 8 suggestions
+    return tuple(matching)
+
+
+@router.get("", response_model=List[str])
+async def get_suggestions(
+    query: str = Query(..., min_length=1, max_length=100),
+    user_id: uuid.UUID = Depends(get_current_user_id)
+):
+    """Get search suggestions based on a query prefix."""
+    return list(_match(query.lower()))
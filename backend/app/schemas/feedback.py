@@ -1,6 +1,6 @@
 """Feedback and analytics schemas."""
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Literal, Optional, List
 from uuid import UUID
 from datetime import datetime
 
@@ -8,10 +8,9 @@ from datetime import datetime
 class FeedbackCreate(BaseModel):
     """Schema for submitting feedback."""
     video_id: str
-    feedback_type: str = Field(
-        ..., 
-        pattern="^(like|dislike|not_interested|wrong_category|helpful|distracting)$"
-    )
+    feedback_type: Literal[
+        "like", "dislike", "not_interested", "wrong_category", "helpful", "distracting"
+    ]
     reason: Optional[str] = Field(None, max_length=500)
     suggested_category: Optional[str] = None
 
@@ -24,13 +23,12 @@ class FeedbackResponse(BaseModel):
     reason: Optional[str]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WatchEvent(BaseModel):
     """Watch event for tracking."""
-    video_id: str
+    video_id: str = Field(..., min_length=1, max_length=20)  # WatchHistory.video_id is String(20)
     watch_duration_seconds: int = Field(ge=0)
     video_duration_seconds: int = Field(ge=0)
     was_skipped: bool = False
@@ -48,8 +46,7 @@ class WatchHistoryItem(BaseModel):
     completed: bool
     watched_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 
 class WatchHistoryResponse(BaseModel):
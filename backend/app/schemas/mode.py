@@ -1,6 +1,6 @@
 """Focus Mode schemas."""
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict
+from typing import Literal, Optional, List
 from uuid import UUID
 from datetime import datetime
 
@@ -57,8 +57,7 @@ class FocusModeResponse(BaseModel):
     blocked_keywords: List[str]
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class LockSessionRequest(BaseModel):
@@ -68,9 +67,9 @@ class LockSessionRequest(BaseModel):
 
 class FilterRuleCreate(BaseModel):
     """Schema for creating a filter rule."""
-    rule_type: str = Field(..., pattern="^(keyword|channel|category|duration|score)$")
+    rule_type: Literal["keyword", "channel", "category", "duration", "score"]
     condition: str = Field(..., min_length=1, max_length=500)
-    action: str = Field(default="block", pattern="^(block|allow|delay)$")
+    action: Literal["block", "allow", "delay"] = "block"
     priority: int = Field(default=0)
 
 
@@ -83,5 +82,4 @@ class FilterRuleResponse(BaseModel):
     priority: int
     is_active: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
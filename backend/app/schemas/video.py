@@ -1,5 +1,5 @@
 """Video and content schemas."""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 
@@ -51,6 +51,9 @@ class FeedItem(BaseModel):
     category: str
     clickbait_score: float
     entertainment_score: float
+    
+    # Built in bulk and never modified after construction
+    model_config = ConfigDict(frozen=True)
 
 
 class FeedResponse(BaseModel):
@@ -1,14 +1,20 @@
 """Services package initialization."""
-from app.services.youtube_service import YouTubeService
-from app.services.ai_classifier import AIClassifier
+from app.services.youtube_service import YouTubeService, get_youtube_service
+from app.services.ai_classifier import AIClassifier, get_ai_classifier
 from app.services.filter_engine import FilterEngine
 from app.services.focus_engine import FocusEngine
 from app.services.personalization import PersonalizationService
+from app.services.watch_events import WatchEventBuffer
+from app.services.classification_cache import ClassificationCache
 
 __all__ = [
     "YouTubeService",
+    "get_youtube_service",
     "AIClassifier",
+    "get_ai_classifier",
     "FilterEngine",
     "FocusEngine",
     "PersonalizationService",
+    "WatchEventBuffer",
+    "ClassificationCache",
 ]
@@ -1,17 +1,278 @@
 """AI Content Classifier using Gemini API."""
-import json
+import re
+import orjson
+import asyncio
+from itertools import accumulate
+from functools import lru_cache
 import google.generativeai as genai
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from datetime import datetime, timedelta
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta, timezone
 
 from app.config import get_settings
 from app.models.content_cache import ContentCache
 from app.schemas.video import VideoClassification
+from app.services.classification_cache import classification_cache
 
 settings = get_settings()
 
+# How long a stored classification stays valid
+_CACHE_TTL = timedelta(hours=24)
+
+# Keyword rules for heuristic classification, in priority order (first match
+# wins): (category, entertainment_score, depth_score, keywords)
+_KEYWORD_RULES = (
+    # Check music FIRST because songs are often misclassified as education
+    ("MUSIC", 0.8, 0.2, (
+        # Direct music indicators
+        "song", "music", "album", "concert", "lyrics", "lyrical", "audio",
+        "official video", "official audio", "music video", "full song",
+        "video song", "vedio song",  # Common typo
+        # Music genres
+        "lofi", "lo-fi", "hip hop", "rap", "rock", "pop", "jazz", "classical",
+        "edm", "dubstep", "remix", "cover", "acoustic", "instrumental",
+        # Indian/Regional music 
+        "tollywood", "bollywood", "kollywood", "sandalwood",
+        "telugu", "hindi", "tamil", "kannada", "malayalam", "bhojpuri",
+        "item song", "romantic song", "melody", "gaana", "gana",
+        "promo song", "title song", "theme song", "trending song",
+        # Artist/Music terms
+        "singer", "vocalist", "rapper", "dj", "producer",
+        "beats", "track", "playlist", "mixtape",
+        # Performance
+        "live performance", "stage", "mtv", "spotify",
+    )),
+    ("GAMING", 0.8, 0.3, (
+        "gameplay", "gaming", "playthrough", "stream", "gamer", "game",
+        "walkthrough", "let's play", "esports", "twitch", "streamer",
+        "minecraft", "fortnite", "valorant", "gta", "cod", "pubg",
+        "elden ring", "zelda", "pokemon", "nintendo", "playstation", "xbox",
+        "speedrun", "pro player", "rank", "competitive"
+    )),
+    ("COMEDY", 0.9, 0.1, (
+        "comedy", "funny", "laugh", "humor", "joke", "stand up", "skit",
+        "prank", "roast", "meme", "compilation", "try not to laugh",
+        "fails", "bloopers", "reaction", "challenge"
+    )),
+    # Only classify as EDUCATION if it's clearly educational
+    ("EDUCATION", 0.2, 0.8, (
+        "tutorial", "course", "lecture", "lesson", "learn", "teaching",
+        "education", "educational", "academy", "university", "college",
+        "programming", "coding", "developer", "software development",
+        "science", "physics", "chemistry", "mathematics", "biology",
+        "history", "geography", "economics", "psychology",
+        "certification", "exam prep", "study with me", "study tips"
+    )),
+    # Tech detection (separate from pure education)
+    ("SCIENCE_TECH", 0.3, 0.7, (
+        "technology", "tech review", "python", "javascript", "java",
+        "machine learning", "ai", "artificial intelligence", "data science",
+        "cloud", "devops", "kubernetes", "docker", "programming tutorial",
+        "code", "engineering", "computer science"
+    )),
+    # How-to/Style detection
+    ("HOWTO_STYLE", 0.4, 0.6, (
+        "how to", "diy", "tips", "tricks", "guide", "step by step",
+        "recipe", "cooking", "baking", "makeup", "fashion", "style",
+        "workout", "fitness", "yoga", "meditation", "self improvement"
+    )),
+    # General entertainment keeps the default category with adjusted scores
+    ("ENTERTAINMENT", 0.7, 0.3, (
+        "movie", "film", "trailer", "teaser", "scenes", "clips",
+        "vlog", "day in", "haul", "unboxing",
+        "celebrity", "interview", "talk show", "reality", "drama"
+    )),
+)
+
+
+def _trie_pattern(words) -> str:
+    """Regex alternation of words, factored on shared prefixes.
+    
+    Branches start with distinct characters, so at any position the engine
+    follows a single path and matches the longest word starting there.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+    
+    return build(trie)
+
+
+# Keyword -> index of the highest-priority rule matching wherever it matches.
+# A match also matches every keyword that is a prefix of it, so those count too.
+_KEYWORD_RULE_INDEX: Dict[str, int] = {}
+for _rule, (_, _, _, _keywords) in enumerate(_KEYWORD_RULES):
+    for _keyword in _keywords:
+        _KEYWORD_RULE_INDEX.setdefault(_keyword, _rule)
+_KEYWORD_RULE_INDEX = {
+    keyword: min(rule for prefix, rule in _KEYWORD_RULE_INDEX.items() if keyword.startswith(prefix))
+    for keyword in _KEYWORD_RULE_INDEX
+}
+
+# Every keyword in one pattern, tried at each position of the text; the
+# lookahead lets matches overlap so no keyword hides another
+_KEYWORD_RE = re.compile("(?=(" + _trie_pattern(_KEYWORD_RULE_INDEX) + "))")
+
+# Words in a channel name that suggest a music label
+_MUSIC_CHANNEL_TOKENS = frozenset((
+    "music", "records", "audio", "songs", "entertainment", "media",
+    "films", "pictures", "studios", "mangavaram", "lahari", "aditya",
+    "zee", "t-series", "sony", "tips", "saregama", "eros"
+))
+# Hyphens stay inside words so names like "t-series" survive as one token
+_CHANNEL_TOKEN_SPLIT = re.compile(r"[^\w-]+").split
+
+# Clickbait indicators. Single words only match as whole words, phrases and
+# emoji anywhere; the combined regex confirms a cheap substring prefilter.
+_CLICKBAIT_PATTERNS = (
+    "you won't believe", "gone wrong", "shocking", "exposed",
+    "prank", "😱", "🔥", "secret", "revealed", "must see",
+    "insane", "crazy", "epic fail", "best ever", "unbelievable"
+)
+_CLICKBAIT_RE = re.compile(
+    r"(?<![a-z])(?:" + "|".join(p for p in _CLICKBAIT_PATTERNS if p.isalpha()) + r")(?![a-z])|"
+    + "|".join(re.escape(p) for p in _CLICKBAIT_PATTERNS if not p.isalpha())
+)
+
+# Markdown code fence Gemini sometimes wraps its JSON answer in
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+# Maps ASCII capitals to 1 and every other byte to 0, so counting capitals
+# in a title is a translate plus count rather than a per-character loop
+_CAPS_TABLE = bytes(1 if 0x41 <= i <= 0x5A else 0 for i in range(256))
+
+
+def _keyword_text(video: Dict[str, Any]) -> str:
+    """Lowercased title, tags, description and channel, for keyword matching."""
+    title = video.get("title_lower")
+    if title is None:
+        title = video.get("title", "").lower()
+    description = video.get("description_lower")
+    if description is None:
+        description = video.get("description", "").lower()
+    description = description[:500]
+    tags = [t.lower() for t in video.get("tags", [])]
+    channel = video.get("channel_title", "").lower()
+    return f"{title} {' '.join(tags)} {description} {channel}"
+
+
+def _best_keyword_rules(texts: List[str]) -> List[Optional[int]]:
+    """Index of the highest-priority keyword rule matching each text, or None.
+    
+    All texts are scanned as one string. No keyword contains the separator,
+    so matches never straddle two texts, and once a text hits the top rule
+    the scan jumps straight to the next one.
+    """
+    joined = "\x00".join(texts)
+    starts = list(accumulate((len(text) + 1 for text in texts), initial=0))
+    best: List[Optional[int]] = [None] * len(texts)
+    
+    i = 0
+    pos = 0
+    while (match := _KEYWORD_RE.search(joined, pos)) is not None:
+        start = match.start()
+        while start >= starts[i + 1]:
+            i += 1
+        rule = _KEYWORD_RULE_INDEX[match.group(1)]
+        if best[i] is None or rule < best[i]:
+            best[i] = rule
+        # Nothing outranks music, so skip the rest of this text
+        pos = starts[i + 1] if rule == 0 else start + 1
+    
+    return best
+
+
+def _score_heuristics(
+    video: Dict[str, Any],
+    text: str,
+    best: Optional[int]
+) -> VideoClassification:
+    """Build a classification from the best keyword rule and the video's metadata."""
+    original_title = video.get("title", "")
+    channel = video.get("channel_title", "").lower()
+    duration = video.get("duration_seconds", 0)
+    
+    # Default values
+    category = "ENTERTAINMENT"
+    clickbait_score = 0.1
+    entertainment_score = 0.5
+    depth_score = 0.5
+    
+    if best == 0:
+        category, entertainment_score, depth_score = _KEYWORD_RULES[0][:3]
+    elif not _MUSIC_CHANNEL_TOKENS.isdisjoint(_CHANNEL_TOKEN_SPLIT(channel)):
+        # Music-related channel names rank just below music keywords
+        category = "MUSIC"
+        entertainment_score = 0.7
+        depth_score = 0.3
+    elif best is not None:
+        category, entertainment_score, depth_score = _KEYWORD_RULES[best][:3]
+    
+    # ============= DURATION-BASED ADJUSTMENTS =============
+    if duration < 60:  # Shorts are usually entertainment
+        if category not in ["MUSIC"]:
+            entertainment_score = max(entertainment_score, 0.7)
+            depth_score = min(depth_score, 0.3)
+    elif duration > 1200:  # 20+ minutes
+        depth_score = min(depth_score + 0.2, 1.0)
+    
+    # ============= CLICKBAIT DETECTION =============
+    # Most videos contain none of the cues, so plain substring checks
+    # rule them out before the (slower) word-boundary regex runs
+    if any(p in text for p in _CLICKBAIT_PATTERNS) and _CLICKBAIT_RE.search(text):
+        clickbait_score = 0.7
+    
+    # ALL CAPS detection
+    caps = original_title.encode("ascii", "ignore").translate(_CAPS_TABLE).count(1)
+    caps_ratio = caps / max(len(original_title), 1)
+    if caps_ratio > 0.5:
+        clickbait_score = max(clickbait_score, 0.5)
+    
+    # Excessive punctuation
+    if "!!!" in original_title or "???" in original_title or "🔴" in original_title:
+        clickbait_score = max(clickbait_score, 0.4)
+    
+    return VideoClassification(
+        category=category,
+        confidence_score=0.6,  # Moderate confidence for heuristics
+        entertainment_score=entertainment_score,
+        depth_score=depth_score,
+        clickbait_score=clickbait_score,
+    )
+
+
+@lru_cache(maxsize=10_000)
+def _classify_content(
+    title: str,
+    description: str,
+    channel_title: str,
+    duration_seconds: int,
+    tags: Tuple[str, ...]
+) -> VideoClassification:
+    """Heuristic classification memoized on the metadata it depends on."""
+    video = {
+        "title": title,
+        "description": description,
+        "channel_title": channel_title,
+        "duration_seconds": duration_seconds,
+        "tags": list(tags),
+    }
+    text = _keyword_text(video)
+    return _score_heuristics(video, text, _best_keyword_rules([text])[0])
+
 
 class AIClassifier:
     """AI-powered video content classifier using Gemini."""
@@ -21,24 +282,23 @@ class AIClassifier:
         "NEWS", "ENTERTAINMENT", "MEME", "CLICKBAIT", "GAMING"
     ]
     
-    CLASSIFICATION_PROMPT = """You are a video content classifier. Analyze the following video metadata and classify it.
+    # Static parts of the classification prompt; only the video details
+    # between them change per call
+    PROMPT_HEADER = """You are a video content classifier. Analyze the following video metadata and classify it.
 
 VIDEO INFORMATION:
-Title: {title}
-Description: {description}
-Tags: {tags}
-Channel: {channel}
-Duration: {duration} seconds
-{transcript_section}
+"""
+    
+    PROMPT_FOOTER = """
 
 TASK: Classify this video and provide scores. Respond ONLY with valid JSON in this exact format:
-{{
+{
     "category": "one of: EDUCATION, STUDY, TECH, MUSIC, PODCAST, NEWS, ENTERTAINMENT, MEME, CLICKBAIT, GAMING",
     "confidence_score": 0.0 to 1.0 (how confident you are in the classification),
     "entertainment_score": 0.0 to 1.0 (0 = purely educational, 1 = purely entertainment),
     "depth_score": 0.0 to 1.0 (0 = shallow/superficial, 1 = deep/informative),
     "clickbait_score": 0.0 to 1.0 (0 = no clickbait, 1 = extreme clickbait)
-}}
+}
 
 CLASSIFICATION GUIDELINES:
 - EDUCATION: Formal courses, tutorials, lectures from educational channels
@@ -60,9 +320,8 @@ Clickbait indicators:
 
 Respond with ONLY the JSON, no other text."""
     
-    def __init__(self):
-        genai.configure(api_key=settings.gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-pro')
+    # Upper bound on in-flight Gemini requests per batch
+    MAX_CONCURRENT_AI_CALLS = 8
     
     async def classify_video(
         self,
@@ -77,23 +336,25 @@ Respond with ONLY the JSON, no other text."""
         """
         video_id = video.get("id")
         
-        # Check cache first
-        if not force_refresh:
+        # Check cache first: memory, then the content_cache table
+        if force_refresh:
+            classification_cache.invalidate(video_id)
+        else:
+            classification = classification_cache.get(video_id)
+            if classification:
+                return classification
             cached = await self._get_cached(video_id, db)
             if cached:
-                return VideoClassification(
-                    category=cached.category,
-                    confidence_score=cached.confidence_score,
-                    entertainment_score=cached.entertainment_score,
-                    depth_score=cached.depth_score,
-                    clickbait_score=cached.clickbait_score,
-                )
+                classification = self._from_cache(cached)
+                classification_cache.set(video_id, classification)
+                return classification
         
         # Use fast heuristic classification by default for speed
         if not use_ai:
             classification = self._fallback_classification(video)
             # Cache result in background (don't await)
             await self._cache_result(video, classification, db)
+            classification_cache.set(video_id, classification)
             return classification
         
         # Classify with AI (slower but more accurate)
@@ -101,9 +362,79 @@ Respond with ONLY the JSON, no other text."""
         
         # Cache result
         await self._cache_result(video, classification, db)
+        classification_cache.set(video_id, classification)
         
         return classification
     
+    async def classify_batch(
+        self,
+        videos: List[Dict[str, Any]],
+        db: AsyncSession,
+        use_ai: bool = False
+    ) -> List[VideoClassification]:
+        """Classify a page of videos with one cache lookup and one commit.
+        
+        Returns classifications in the same order as ``videos``.
+        """
+        classifications: Dict[str, VideoClassification] = {}
+        for video in videos:
+            classification = classification_cache.get(video.get("id"))
+            if classification:
+                classifications[video.get("id")] = classification
+        
+        # Only go to the database for videos not held in memory
+        video_ids = {video.get("id") for video in videos} - classifications.keys()
+        cache_rows = await self._get_cached_bulk(video_ids, db) if video_ids else {}
+        
+        # Serve fresh cache hits, collect each uncached video once
+        misses: Dict[str, Dict[str, Any]] = {}
+        for video in videos:
+            video_id = video.get("id")
+            if video_id in classifications:
+                continue
+            cached = cache_rows.get(video_id)
+            if cached:
+                classifications[video_id] = self._from_cache(cached)
+                classification_cache.set(video_id, classifications[video_id])
+            else:
+                misses.setdefault(video_id, video)
+        
+        if misses:
+            if use_ai:
+                # Overlap the Gemini round trips, capped to stay within rate limits
+                semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_AI_CALLS)
+                
+                async def classify_one(video: Dict[str, Any]) -> VideoClassification:
+                    async with semaphore:
+                        return await self._classify_with_ai(video)
+                
+                results = await asyncio.gather(*(classify_one(v) for v in misses.values()))
+            else:
+                results = self._fallback_classification_batch(list(misses.values()))
+            
+            for video_id, classification in zip(misses, results):
+                classifications[video_id] = classification
+            await self._upsert_cache([
+                self._cache_row(video, classifications[video_id])
+                for video_id, video in misses.items()
+            ], db)
+            await db.commit()
+            
+            for video_id in misses:
+                classification_cache.set(video_id, classifications[video_id])
+        
+        return [classifications[video.get("id")] for video in videos]
+    
+    def _from_cache(self, cached: ContentCache) -> VideoClassification:
+        """Build a classification from a cache row."""
+        return VideoClassification(
+            category=cached.category,
+            confidence_score=cached.confidence_score,
+            entertainment_score=cached.entertainment_score,
+            depth_score=cached.depth_score,
+            clickbait_score=cached.clickbait_score,
+        )
+    
     async def _get_cached(
         self,
         video_id: str,
@@ -111,14 +442,26 @@ Respond with ONLY the JSON, no other text."""
     ) -> Optional[ContentCache]:
         """Get cached classification if not expired."""
         result = await db.execute(
-            select(ContentCache).where(ContentCache.video_id == video_id)
+            select(ContentCache).where(
+                ContentCache.video_id == video_id,
+                ~ContentCache.is_expired
+            )
         )
-        cached = result.scalar_one_or_none()
-        
-        if cached and not cached.is_expired():
-            return cached
-        
-        return None
+        return result.scalar_one_or_none()
+    
+    async def _get_cached_bulk(
+        self,
+        video_ids: Iterable[str],
+        db: AsyncSession
+    ) -> Dict[str, ContentCache]:
+        """Get unexpired cached classifications for many videos in one query."""
+        result = await db.execute(
+            select(ContentCache).where(
+                ContentCache.video_id.in_(video_ids),
+                ~ContentCache.is_expired
+            )
+        )
+        return {row.video_id: row for row in result.scalars()}
     
     async def _classify_with_ai(self, video: Dict[str, Any]) -> VideoClassification:
         """Classify video content using Gemini API."""
@@ -130,29 +473,23 @@ Respond with ONLY the JSON, no other text."""
             transcript_preview = transcript[:2000]
             transcript_section = f"\nTranscript Preview (first 2000 chars):\n{transcript_preview}"
         
-        # Format prompt
-        prompt = self.CLASSIFICATION_PROMPT.format(
-            title=video.get("title", ""),
-            description=video.get("description", "")[:500],  # Limit description
-            tags=", ".join(video.get("tags", [])[:20]),  # Limit tags
-            channel=video.get("channel_title", "Unknown"),
-            duration=video.get("duration_seconds", 0),
-            transcript_section=transcript_section
-        )
+        # Only the video details are formatted; the static text is concatenated as-is
+        title = video.get("title", "")
+        description = video.get("description", "")[:500]  # Limit description
+        tags = ", ".join(video.get("tags", [])[:20])  # Limit tags
+        channel = video.get("channel_title", "Unknown")
+        duration = video.get("duration_seconds", 0)
+        prompt = "".join((
+            self.PROMPT_HEADER,
+            f"Title: {title}\nDescription: {description}\nTags: {tags}\n"
+            f"Channel: {channel}\nDuration: {duration} seconds\n{transcript_section}",
+            self.PROMPT_FOOTER,
+        ))
         
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
-            
-            # Parse JSON response
-            # Handle potential markdown code blocks
-            if text.startswith("```"):
-                text = text.split("```")[1]
-                if text.startswith("json"):
-                    text = text[4:]
-                text = text.strip()
-            
-            result = json.loads(text)
+            response = await _get_model().generate_content_async(prompt)
+            # Parse JSON response, stripping any markdown code fence
+            result = orjson.loads(_FENCE_RE.sub("", response.text.strip()))
             
             # Validate and normalize
             category = result.get("category", "ENTERTAINMENT").upper()
@@ -181,190 +518,25 @@ Respond with ONLY the JSON, no other text."""
         4. COMEDY - Comedy content
         5. Then check educational/study content
         """
-        title = video.get("title", "").lower()
-        original_title = video.get("title", "")
-        description = video.get("description", "").lower()[:500]
-        tags = [t.lower() for t in video.get("tags", [])]
-        channel = video.get("channel_title", "").lower()
-        duration = video.get("duration_seconds", 0)
-        
-        # Default values
-        category = "ENTERTAINMENT"
-        clickbait_score = 0.1
-        entertainment_score = 0.5
-        depth_score = 0.5
-        
-        # Combined text for keyword matching
-        text = f"{title} {' '.join(tags)} {description} {channel}"
-        
-        # ============= PRIORITY 1: MUSIC DETECTION =============
-        # Check music FIRST because songs are often misclassified as education
-        music_keywords = [
-            # Direct music indicators
-            "song", "music", "album", "concert", "lyrics", "lyrical", "audio",
-            "official video", "official audio", "music video", "full song",
-            "video song", "vedio song",  # Common typo
-            # Music genres
-            "lofi", "lo-fi", "hip hop", "rap", "rock", "pop", "jazz", "classical",
-            "edm", "dubstep", "remix", "cover", "acoustic", "instrumental",
-            # Indian/Regional music 
-            "tollywood", "bollywood", "kollywood", "sandalwood",
-            "telugu", "hindi", "tamil", "kannada", "malayalam", "bhojpuri",
-            "item song", "romantic song", "melody", "gaana", "gana",
-            "promo song", "title song", "theme song", "trending song",
-            # Artist/Music terms
-            "singer", "vocalist", "rapper", "dj", "producer",
-            "beats", "track", "playlist", "mixtape",
-            # Performance
-            "live performance", "stage", "concert", "mtv", "spotify", "gaana",
-        ]
-        
-        for kw in music_keywords:
-            if kw in text:
-                category = "MUSIC"
-                entertainment_score = 0.8
-                depth_score = 0.2
-                break
-        
-        # Also check for music-related channel names
-        music_channel_indicators = [
-            "music", "records", "audio", "songs", "entertainment", "media",
-            "films", "pictures", "studios", "mangavaram", "lahari", "aditya",
-            "zee", "t-series", "sony", "tips", "saregama", "eros"
-        ]
-        if category != "MUSIC":
-            for ind in music_channel_indicators:
-                if ind in channel:
-                    category = "MUSIC"
-                    entertainment_score = 0.7
-                    depth_score = 0.3
-                    break
-        
-        # ============= PRIORITY 2: GAMING DETECTION =============
-        if category == "ENTERTAINMENT":  # Only check if not already music
-            gaming_keywords = [
-                "gameplay", "gaming", "playthrough", "stream", "gamer", "game",
-                "walkthrough", "let's play", "esports", "twitch", "streamer",
-                "minecraft", "fortnite", "valorant", "gta", "cod", "pubg",
-                "elden ring", "zelda", "pokemon", "nintendo", "playstation", "xbox",
-                "speedrun", "pro player", "rank", "competitive"
-            ]
-            for kw in gaming_keywords:
-                if kw in text:
-                    category = "GAMING"
-                    entertainment_score = 0.8
-                    depth_score = 0.3
-                    break
-        
-        # ============= PRIORITY 3: COMEDY/ENTERTAINMENT DETECTION =============
-        if category == "ENTERTAINMENT":
-            comedy_keywords = [
-                "comedy", "funny", "laugh", "humor", "joke", "stand up", "skit",
-                "prank", "roast", "meme", "compilation", "try not to laugh",
-                "fails", "bloopers", "reaction", "challenge"
-            ]
-            for kw in comedy_keywords:
-                if kw in text:
-                    category = "COMEDY"
-                    entertainment_score = 0.9
-                    depth_score = 0.1
-                    break
-        
-        general_entertainment = [
-            "movie", "film", "trailer", "teaser", "scenes", "clips",
-            "vlog", "day in", "haul", "unboxing", "reaction",
-            "celebrity", "interview", "talk show", "reality", "drama"
-        ]
-        if category == "ENTERTAINMENT":
-            for kw in general_entertainment:
-                if kw in text:
-                    entertainment_score = 0.7
-                    depth_score = 0.3
-                    break
-        
-        # ============= PRIORITY 4: EDUCATIONAL/STUDY CONTENT =============
-        # Only classify as EDUCATION if it's clearly educational
-        if category == "ENTERTAINMENT":
-            education_keywords = [
-                "tutorial", "course", "lecture", "lesson", "learn", "teaching",
-                "education", "educational", "academy", "university", "college",
-                "programming", "coding", "developer", "software development",
-                "science", "physics", "chemistry", "mathematics", "biology",
-                "history", "geography", "economics", "psychology",
-                "certification", "exam prep", "study with me", "study tips"
-            ]
-            for kw in education_keywords:
-                if kw in text:
-                    category = "EDUCATION"
-                    entertainment_score = 0.2
-                    depth_score = 0.8
-                    break
-        
-        # Tech detection (separate from pure education)
-        if category == "ENTERTAINMENT":
-            tech_keywords = [
-                "technology", "tech review", "python", "javascript", "java",
-                "machine learning", "ai", "artificial intelligence", "data science",
-                "cloud", "devops", "kubernetes", "docker", "programming tutorial",
-                "code", "developer", "engineering", "computer science"
-            ]
-            for kw in tech_keywords:
-                if kw in text:
-                    category = "SCIENCE_TECH"
-                    entertainment_score = 0.3
-                    depth_score = 0.7
-                    break
-        
-        # How-to/Style detection
-        if category == "ENTERTAINMENT":
-            howto_keywords = [
-                "how to", "diy", "tips", "tricks", "guide", "step by step",
-                "recipe", "cooking", "baking", "makeup", "fashion", "style",
-                "workout", "fitness", "yoga", "meditation", "self improvement"
-            ]
-            for kw in howto_keywords:
-                if kw in text:
-                    category = "HOWTO_STYLE"
-                    entertainment_score = 0.4
-                    depth_score = 0.6
-                    break
-        
-        # ============= DURATION-BASED ADJUSTMENTS =============
-        if duration < 60:  # Shorts are usually entertainment
-            if category not in ["MUSIC"]:
-                entertainment_score = max(entertainment_score, 0.7)
-                depth_score = min(depth_score, 0.3)
-        elif duration > 1200:  # 20+ minutes
-            depth_score = min(depth_score + 0.2, 1.0)
-        
-        # ============= CLICKBAIT DETECTION =============
-        clickbait_patterns = [
-            "you won't believe", "gone wrong", "shocking", "exposed",
-            "prank", "😱", "🔥", "secret", "revealed", "must see",
-            "insane", "crazy", "epic fail", "best ever", "unbelievable"
-        ]
-        for pattern in clickbait_patterns:
-            if pattern in text:
-                clickbait_score = 0.7
-                break
-        
-        # ALL CAPS detection
-        caps_ratio = sum(1 for c in original_title if c.isupper()) / max(len(original_title), 1)
-        if caps_ratio > 0.5:
-            clickbait_score = max(clickbait_score, 0.5)
-        
-        # Excessive punctuation
-        if "!!!" in original_title or "???" in original_title or "🔴" in original_title:
-            clickbait_score = max(clickbait_score, 0.4)
-        
-        return VideoClassification(
-            category=category,
-            confidence_score=0.6,  # Moderate confidence for heuristics
-            entertainment_score=entertainment_score,
-            depth_score=depth_score,
-            clickbait_score=clickbait_score,
+        return _classify_content(
+            video.get("title", ""),
+            video.get("description", ""),
+            video.get("channel_title", ""),
+            video.get("duration_seconds", 0),
+            tuple(video.get("tags", [])),
         )
     
+    def _fallback_classification_batch(
+        self,
+        videos: List[Dict[str, Any]]
+    ) -> List[VideoClassification]:
+        """Heuristically classify a page of videos with one keyword scan over all of them."""
+        texts = [_keyword_text(video) for video in videos]
+        return [
+            _score_heuristics(video, text, rule)
+            for video, text, rule in zip(videos, texts, _best_keyword_rules(texts))
+        ]
+    
     async def _cache_result(
         self,
         video: Dict[str, Any],
@@ -372,45 +544,69 @@ Respond with ONLY the JSON, no other text."""
         db: AsyncSession
     ):
         """Cache classification result in database."""
-        video_id = video.get("id")
-        
-        # Check if entry exists
-        result = await db.execute(
-            select(ContentCache).where(ContentCache.video_id == video_id)
-        )
-        existing = result.scalar_one_or_none()
+        await self._upsert_cache([self._cache_row(video, classification)], db)
+        await db.commit()
+    
+    async def _upsert_cache(self, rows: List[Dict[str, Any]], db: AsyncSession):
+        """Insert cache rows in one statement, refreshing the classification of existing ones.
         
-        if existing:
-            # Update existing
-            existing.category = classification.category
-            existing.confidence_score = classification.confidence_score
-            existing.entertainment_score = classification.entertainment_score
-            existing.depth_score = classification.depth_score
-            existing.clickbait_score = classification.clickbait_score
-            existing.analyzed_at = datetime.utcnow()
-            existing.expires_at = datetime.utcnow() + timedelta(hours=24)
-        else:
-            # Create new
-            cache = ContentCache(
-                video_id=video_id,
-                title=video.get("title", ""),
-                description=video.get("description", ""),
-                channel_id=video.get("channel_id"),
-                channel_title=video.get("channel_title"),
-                tags=video.get("tags", []),
-                thumbnail_url=video.get("thumbnail_url"),
-                duration_seconds=video.get("duration_seconds", 0),
-                is_short=video.get("is_short", False),
-                language=video.get("language"),
-                view_count=video.get("view_count", 0),
-                like_count=video.get("like_count", 0),
-                published_at=video.get("published_at"),
-                category=classification.category,
-                confidence_score=classification.confidence_score,
-                entertainment_score=classification.entertainment_score,
-                depth_score=classification.depth_score,
-                clickbait_score=classification.clickbait_score,
+        Rows must have distinct video ids.
+        """
+        # One timestamp for the whole batch; the columns hold naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        expires_at = now + _CACHE_TTL
+        stmt = pg_insert(ContentCache).values([
+            {**row, "analyzed_at": now, "expires_at": expires_at} for row in rows
+        ])
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ContentCache.video_id],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in (
+                        "category", "confidence_score", "entertainment_score",
+                        "depth_score", "clickbait_score", "analyzed_at", "expires_at",
+                    )
+                },
             )
-            db.add(cache)
-        
-        await db.commit()
+        )
+    
+    def _cache_row(
+        self,
+        video: Dict[str, Any],
+        classification: VideoClassification
+    ) -> Dict[str, Any]:
+        """Column values for a video's content_cache row, less the timestamps."""
+        return {
+            "video_id": video.get("id"),
+            "title": video.get("title", ""),
+            "description": video.get("description", ""),
+            "channel_id": video.get("channel_id"),
+            "channel_title": video.get("channel_title"),
+            "tags": video.get("tags", []),
+            "thumbnail_url": video.get("thumbnail_url"),
+            "duration_seconds": video.get("duration_seconds", 0),
+            "is_short": video.get("is_short", False),
+            "language": video.get("language"),
+            "view_count": video.get("view_count", 0),
+            "like_count": video.get("like_count", 0),
+            "published_at": video.get("published_at"),
+            "category": classification.category,
+            "confidence_score": classification.confidence_score,
+            "entertainment_score": classification.entertainment_score,
+            "depth_score": classification.depth_score,
+            "clickbait_score": classification.clickbait_score,
+        }
+
+
+@lru_cache()
+def _get_model() -> genai.GenerativeModel:
+    """Configure Gemini and build the model on first AI classification."""
+    genai.configure(api_key=settings.gemini_api_key)
+    return genai.GenerativeModel('gemini-pro')
+
+
+@lru_cache()
+def get_ai_classifier() -> AIClassifier:
+    """Get the shared AIClassifier instance."""
+    return AIClassifier()
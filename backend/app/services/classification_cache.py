@@ -0,0 +1,46 @@
+"""In-process cache of video classifications."""
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.schemas.video import VideoClassification
+
+
+class ClassificationCache:
+    """LRU cache of video_id -> classification with a fixed TTL.
+    
+    Sits in front of the content_cache table so repeat videos (trending,
+    re-served feed pages) skip the database lookup entirely. Entries are
+    per-process; the table remains the shared source of truth.
+    """
+    
+    def __init__(self, ttl_seconds: float = 24 * 3600, max_size: int = 50_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[VideoClassification, float]]" = OrderedDict()
+    
+    def get(self, video_id: str) -> Optional[VideoClassification]:
+        """Return the cached classification, or None if missing or stale."""
+        entry = self._entries.get(video_id)
+        if entry is None:
+            return None
+        classification, cached_at = entry
+        if time.monotonic() - cached_at >= self.ttl_seconds:
+            del self._entries[video_id]
+            return None
+        self._entries.move_to_end(video_id)
+        return classification
+    
+    def set(self, video_id: str, classification: VideoClassification) -> None:
+        """Store a classification, evicting the least recently used entry if full."""
+        self._entries[video_id] = (classification, time.monotonic())
+        self._entries.move_to_end(video_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def invalidate(self, video_id: str) -> None:
+        """Forget a video so the next lookup reclassifies it."""
+        self._entries.pop(video_id, None)
+
+
+classification_cache = ClassificationCache()
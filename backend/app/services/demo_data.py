@@ -1,10 +1,15 @@
 """Demo data for when YouTube API is unavailable (e.g., quota exceeded)."""
 from datetime import datetime, timedelta
 import random
-import hashlib
+import sys
+from collections import namedtuple
+from functools import lru_cache
+from itertools import chain, count
+from string import Formatter
+from types import MappingProxyType
 
 # Expanded demo videos organized by category - MUCH more content
-DEMO_VIDEOS = {
+_RAW_DEMO_VIDEOS = {
     "EDUCATION": [
         {"id": "edu_1", "title": "Python Tutorial for Beginners - Full Course", "channel_title": "Programming with Mosh", "duration_seconds": 3600, "view_count": 15000000, "thumbnail_url": "https://i.ytimg.com/vi/rfscVS0vtbw/hqdefault.jpg"},
         {"id": "edu_2", "title": "Machine Learning Full Course - 12 Hours", "channel_title": "freeCodeCamp", "duration_seconds": 43200, "view_count": 8000000, "thumbnail_url": "https://i.ytimg.com/vi/GwIo3gDZCVQ/hqdefault.jpg"},
@@ -139,200 +144,295 @@ DEMO_VIDEOS = {
     ],
 }
 
-# Page tracking for pagination
-_page_state = {}
+# Read-only view of the demo table: shared by every request, so nothing may write to it
+DEMO_VIDEOS = MappingProxyType({
+    cat: tuple(MappingProxyType(video) for video in videos)
+    for cat, videos in _RAW_DEMO_VIDEOS.items()
+})
+del _RAW_DEMO_VIDEOS
 
-def get_demo_videos(categories=None, max_results=20, page_token=None):
-    """Get demo videos, optionally filtered by categories, with pagination support."""
-    all_videos = []
-    
-    if categories:
-        # Get videos from specified categories with their category label
-        for cat in categories:
-            if cat in DEMO_VIDEOS:
-                for video in DEMO_VIDEOS[cat]:
-                    video_copy = dict(video)
-                    video_copy["category"] = cat  # Add category field
-                    all_videos.append(video_copy)
-    else:
-        # Get videos from all categories with their category labels
-        for cat, videos in DEMO_VIDEOS.items():
-            for video in videos:
-                video_copy = dict(video)
-                video_copy["category"] = cat  # Add category field
-                all_videos.append(video_copy)
-    
-    # Add common fields
-    now = datetime.utcnow()
-    for i, video in enumerate(all_videos):
-        # Create unique ID with random suffix for pagination
-        base_id = video.get("id", f"video_{i}")
-        video["id"] = f"{base_id}_{random.randint(1000, 9999)}"
-        video["is_short"] = video.get("duration_seconds", 0) < 60
-        video["published_at"] = (now - timedelta(days=random.randint(1, 365))).isoformat() + "Z"
-        if not video.get("thumbnail_url"):
-            video["thumbnail_url"] = f"https://via.placeholder.com/320x180?text={video['title'][:20]}"
-        # Add default scores for fast filtering
-        video["clickbait_score"] = 0.1
-        video["entertainment_score"] = 0.3 if video.get("category") in ["EDUCATION", "SCIENCE_TECH"] else 0.6
+# Default entertainment score by category; anything not listed gets 0.6
+_ENTERTAINMENT_SCORE = {"EDUCATION": 0.3, "SCIENCE_TECH": 0.3}
+
+# Demo video with every static feed field resolved; immutable and compact
+DemoVideo = namedtuple(
+    "DemoVideo",
+    "id title channel_title duration_seconds view_count thumbnail_url "
+    "category is_short clickbait_score entertainment_score",
+)
+
+
+def _enrich(video, category):
+    """Resolve a demo video literal into a record with the fields every feed item needs."""
+    return DemoVideo(
+        id=video["id"],
+        title=video["title"],
+        # Interned: channels repeat across videos and categories repeat 20x
+        channel_title=sys.intern(video["channel_title"]),
+        duration_seconds=video["duration_seconds"],
+        view_count=video["view_count"],
+        thumbnail_url=video["thumbnail_url"] or f"https://via.placeholder.com/320x180?text={video['title'][:20]}",
+        category=sys.intern(category),
+        is_short=video["duration_seconds"] < 60,
+        # Default scores for fast filtering
+        clickbait_score=0.1,
+        entertainment_score=_ENTERTAINMENT_SCORE.get(category, 0.6),
+    )
+
+
+def _build_flat_index():
+    """Concatenate the enriched categories and record the range each one occupies."""
+    flat = []
+    ranges = {}
+    for cat, videos in DEMO_VIDEOS.items():
+        start = len(flat)
+        flat.extend(_enrich(video, cat) for video in videos)
+        ranges[cat] = (start, len(flat))
+    return tuple(flat), ranges
+
+
+# Every demo video with its static fields filled in once at import, plus
+# category -> (start, stop) of its contiguous run in _FLAT
+_FLAT, _CAT_RANGES = _build_flat_index()
+_EMPTY_RANGE = (0, 0)  # Unknown categories contribute nothing
+
+# Suffix that keeps each served copy of a demo video unique
+_id_counter = count(1)
+
+_PUBLISHED_AT_FORMAT = "%Y-%m-%dT%H:%M:%SZ"  # UTC, built in one strftime call
+
+
+@lru_cache(maxsize=1)
+def _day_offsets_iso(hour):
+    """Publish dates 1-365 days before the given hour, formatted once per hour."""
+    return tuple(
+        (hour - timedelta(days=days)).strftime(_PUBLISHED_AT_FORMAT)
+        for days in range(1, 366)
+    )
+
+
+@lru_cache(maxsize=64)
+def _build_pool(categories_key):
+    """Demo videos for a set of categories (None for all), assembled once per set."""
+    if categories_key is None:
+        return _FLAT
+    # Slices of the flat table for the specified categories
+    return tuple(chain.from_iterable(
+        _FLAT[slice(*_CAT_RANGES.get(cat, _EMPTY_RANGE))] for cat in categories_key
+    ))
+
+
+def get_demo_videos(categories=None, max_results=20):
+    """Get a random page of demo videos, optionally filtered by categories."""
+    pool = _build_pool(frozenset(categories) if categories else None)
     
-    # Shuffle for random order
-    random.shuffle(all_videos)
+    # Pick the random page first, then build dicts only for the videos being returned
+    sampled = random.sample(pool, min(max_results, len(pool)))
+    # One C-level call draws every publish date for the page
+    dates = random.choices(
+        _day_offsets_iso(datetime.utcnow().replace(minute=0, second=0, microsecond=0)),
+        k=len(sampled),
+    )
+    # Plain dicts: the feed mixes these with generated videos and filters both by key
+    videos = []
+    for base, published_at in zip(sampled, dates):
+        videos.append({
+            # Unique ID with a counter suffix for pagination
+            "id": base.id + "_" + str(next(_id_counter)),
+            "title": base.title,
+            "channel_title": base.channel_title,
+            "duration_seconds": base.duration_seconds,
+            "view_count": base.view_count,
+            "thumbnail_url": base.thumbnail_url,
+            "category": base.category,
+            "is_short": base.is_short,
+            "published_at": published_at,
+            "clickbait_score": base.clickbait_score,
+            "entertainment_score": base.entertainment_score,
+        })
     
-    return all_videos[:max_results]
+    return videos
+
+
+# Title templates for generated videos, by category
+_RAW_TITLE_TEMPLATES = {
+    "EDUCATION": [
+        "{topic} Tutorial for Beginners", 
+        "Learn {topic} in {time}", 
+        "{topic} Full Course",
+        "Master {topic} Step by Step",
+        "{topic} Complete Guide",
+        "Introduction to {topic}",
+        "{topic} Crash Course",
+        "Advanced {topic} Techniques",
+        "{topic} Tips and Tricks",
+        "{topic} Best Practices"
+    ],
+    "SCIENCE_TECH": [
+        "How {tech} Works",
+        "The Science of {topic}",
+        "{tech} Explained Simply",
+        "The Future of {tech}",
+        "{topic} Deep Dive",
+        "Understanding {topic}",
+        "{tech} vs {alt_tech}",
+        "Why {tech} Matters",
+        "{topic} Revolution",
+        "Inside {tech}"
+    ],
+    "NEWS_POLITICS": [
+        "Breaking: {topic} Update {year}",
+        "Analysis: The {topic} Situation",
+        "Daily News Roundup: {topic}",
+        "What's Happening with {topic}",
+        "{topic}: Expert Analysis",
+        "Current Events: {topic} Report",
+        "Weekly News: {topic} Updates",
+        "{topic} News Explained",
+        "Top Stories: {topic} Today",
+        "News Brief: {topic} Summary"
+    ],
+    "HOWTO_STYLE": [
+        "How to {action} - Complete Guide",
+        "{action} Tips for Beginners",
+        "DIY {project} Tutorial",
+        "Easy Ways to {action}",
+        "{action} Step by Step",
+        "Quick {action} Tutorial",
+        "Best {action} Techniques",
+        "Beginner's Guide to {action}",
+        "{action} Made Simple",
+        "Pro Tips for {action}"
+    ],
+    "MUSIC": [
+        "{genre} Music for {activity}",
+        "{mood} {genre} Playlist",
+        "Best {genre} Hits {year}",
+        "{genre} Mix - {duration}",
+        "Relaxing {genre} Music",
+        "{genre} Vibes",
+        "{mood} Songs Playlist",
+        "{genre} for Focus",
+        "Chill {genre} Mix",
+        "{genre} Essentials"
+    ],
+    "GAMING": [
+        "{game} Gameplay - Full Walkthrough",
+        "{game} Tips and Tricks",
+        "Best {game} Strategies",
+        "{game} Pro Guide",
+        "{game} for Beginners",
+        "{game} Stream Highlights",
+        "{game} Epic Moments",
+        "{game} Tutorial",
+        "{game} Ranked Guide",
+        "{game} Review {year}"
+    ],
+    "ENTERTAINMENT": [
+        "Top 10 {topic} Moments",
+        "Best of {topic} {year}",
+        "{topic} Compilation",
+        "Amazing {topic} Stories",
+        "{topic} Documentary",
+        "{topic} Behind the Scenes",
+        "Incredible {topic} Facts",
+        "{topic} Highlights",
+        "Epic {topic} Moments",
+        "{topic} Review"
+    ],
+}
+
+_TOPICS = ["Python", "JavaScript", "React", "Machine Learning", "AI", "Data Science", 
+           "Web Development", "Mobile Apps", "Cloud Computing", "DevOps", "Cybersecurity"]
+_TECHS = ["Quantum Computing", "Blockchain", "5G", "IoT", "VR", "AR", "Robotics", "Drones"]
+_GENRES = ["Lofi", "Jazz", "Classical", "Electronic", "Ambient", "Pop", "Rock", "Hip Hop"]
+_MOODS = ["Chill", "Upbeat", "Relaxing", "Energetic", "Peaceful", "Happy"]
+_ACTIVITIES = ["Study", "Work", "Sleep", "Focus", "Meditation", "Coding", "Reading"]
+_ACTIONS = ["Cook", "Build", "Create", "Design", "Organize", "Clean", "Decorate", "Fix"]
+_PROJECTS = ["Furniture", "Garden", "Room Decor", "Storage", "Kitchen", "Office", "Workshop"]
+_GAMES = ["Minecraft", "Fortnite", "Valorant", "GTA", "Elden Ring", "Zelda", "Mario", "Pokemon"]
+_CHANNELS = ["TechMaster", "CodeAcademy", "ScienceHub", "MusicVibes", "LearnDaily", 
+             "DigitalNomad", "StudyBuddy", "FutureTech", "ChillBeats", "EduPro",
+             "NewsToday", "GamePro", "DIYMaster", "TopNews", "EntertainNow"]
+
+# Draws for each placeholder a title template can use
+_PLACEHOLDER_POOLS = {
+    "topic": _TOPICS,
+    "tech": _TECHS,
+    "alt_tech": _TECHS,
+    "genre": _GENRES,
+    "mood": _MOODS,
+    "activity": _ACTIVITIES,
+    "action": _ACTIONS,
+    "project": _PROJECTS,
+    "game": _GAMES,
+    "time": ["1 Hour", "30 Minutes", "2 Hours"],
+    "duration": ["1 Hour Mix", "2 Hour Session"],
+    "year": ["2024"],
+}
+
+# Each template paired with the placeholders it contains, parsed once
+_TITLE_TEMPLATES = {
+    cat: tuple(
+        (template, tuple(field for _, field, _, _ in Formatter().parse(template) if field))
+        for template in cat_templates
+    )
+    for cat, cat_templates in _RAW_TITLE_TEMPLATES.items()
+}
+
+
+# Value ranges for generated videos (inclusive bounds, as randint used them)
+_DURATION_RANGE = range(300, 7201)
+_VIEW_COUNT_RANGE = range(100000, 50000001)
 
 
 def generate_dynamic_videos(categories=None, count=50, seed=None):
     """Generate dynamic video content for infinite scrolling."""
-    if seed:
-        random.seed(seed)
-    
-    # Base video templates for generating variety
-    templates = {
-        "EDUCATION": [
-            "{topic} Tutorial for Beginners", 
-            "Learn {topic} in {time}", 
-            "{topic} Full Course",
-            "Master {topic} Step by Step",
-            "{topic} Complete Guide",
-            "Introduction to {topic}",
-            "{topic} Crash Course",
-            "Advanced {topic} Techniques",
-            "{topic} Tips and Tricks",
-            "{topic} Best Practices"
-        ],
-        "SCIENCE_TECH": [
-            "How {tech} Works",
-            "The Science of {topic}",
-            "{tech} Explained Simply",
-            "The Future of {tech}",
-            "{topic} Deep Dive",
-            "Understanding {topic}",
-            "{tech} vs {alt_tech}",
-            "Why {tech} Matters",
-            "{topic} Revolution",
-            "Inside {tech}"
-        ],
-        "NEWS_POLITICS": [
-            "Breaking: {topic} Update {year}",
-            "Analysis: The {topic} Situation",
-            "Daily News Roundup: {topic}",
-            "What's Happening with {topic}",
-            "{topic}: Expert Analysis",
-            "Current Events: {topic} Report",
-            "Weekly News: {topic} Updates",
-            "{topic} News Explained",
-            "Top Stories: {topic} Today",
-            "News Brief: {topic} Summary"
-        ],
-        "HOWTO_STYLE": [
-            "How to {action} - Complete Guide",
-            "{action} Tips for Beginners",
-            "DIY {project} Tutorial",
-            "Easy Ways to {action}",
-            "{action} Step by Step",
-            "Quick {action} Tutorial",
-            "Best {action} Techniques",
-            "Beginner's Guide to {action}",
-            "{action} Made Simple",
-            "Pro Tips for {action}"
-        ],
-        "MUSIC": [
-            "{genre} Music for {activity}",
-            "{mood} {genre} Playlist",
-            "Best {genre} Hits {year}",
-            "{genre} Mix - {duration}",
-            "Relaxing {genre} Music",
-            "{genre} Vibes",
-            "{mood} Songs Playlist",
-            "{genre} for Focus",
-            "Chill {genre} Mix",
-            "{genre} Essentials"
-        ],
-        "GAMING": [
-            "{game} Gameplay - Full Walkthrough",
-            "{game} Tips and Tricks",
-            "Best {game} Strategies",
-            "{game} Pro Guide",
-            "{game} for Beginners",
-            "{game} Stream Highlights",
-            "{game} Epic Moments",
-            "{game} Tutorial",
-            "{game} Ranked Guide",
-            "{game} Review {year}"
-        ],
-        "ENTERTAINMENT": [
-            "Top 10 {topic} Moments",
-            "Best of {topic} {year}",
-            "{topic} Compilation",
-            "Amazing {topic} Stories",
-            "{topic} Documentary",
-            "{topic} Behind the Scenes",
-            "Incredible {topic} Facts",
-            "{topic} Highlights",
-            "Epic {topic} Moments",
-            "{topic} Review"
-        ],
-    }
-    
-    topics = ["Python", "JavaScript", "React", "Machine Learning", "AI", "Data Science", 
-              "Web Development", "Mobile Apps", "Cloud Computing", "DevOps", "Cybersecurity"]
-    techs = ["Quantum Computing", "Blockchain", "5G", "IoT", "VR", "AR", "Robotics", "Drones"]
-    genres = ["Lofi", "Jazz", "Classical", "Electronic", "Ambient", "Pop", "Rock", "Hip Hop"]
-    moods = ["Chill", "Upbeat", "Relaxing", "Energetic", "Peaceful", "Happy"]
-    activities = ["Study", "Work", "Sleep", "Focus", "Meditation", "Coding", "Reading"]
-    actions = ["Cook", "Build", "Create", "Design", "Organize", "Clean", "Decorate", "Fix"]
-    projects = ["Furniture", "Garden", "Room Decor", "Storage", "Kitchen", "Office", "Workshop"]
-    games = ["Minecraft", "Fortnite", "Valorant", "GTA", "Elden Ring", "Zelda", "Mario", "Pokemon"]
-    channels = ["TechMaster", "CodeAcademy", "ScienceHub", "MusicVibes", "LearnDaily", 
-                "DigitalNomad", "StudyBuddy", "FutureTech", "ChillBeats", "EduPro",
-                "NewsToday", "GamePro", "DIYMaster", "TopNews", "EntertainNow"]
+    # Local generator: seeding the global one would leak across concurrent requests
+    rng = random.Random(seed or None)
     
     generated = []
     
     # Filter to only categories we have templates for
     available_cats = [c for c in (categories or list(DEMO_VIDEOS.keys())) 
-                      if c in templates]
+                      if c in _TITLE_TEMPLATES]
     if not available_cats:
         available_cats = ["EDUCATION"]  # Fallback
     
+    # Numeric fields and publish dates drawn for the whole batch in C-level calls
+    durations = rng.choices(_DURATION_RANGE, k=count)
+    views = rng.choices(_VIEW_COUNT_RANGE, k=count)
+    dates = rng.choices(
+        _day_offsets_iso(datetime.utcnow().replace(minute=0, second=0, microsecond=0)),
+        k=count,
+    )
+    # 10 hex characters of id per video, from a single draw
+    id_hex = rng.randbytes(5 * count).hex()
+    
     for i in range(count):
         # Cycle through categories evenly
         cat = available_cats[i % len(available_cats)]
         
-        title_templates = templates.get(cat, templates["EDUCATION"])
-        title = random.choice(title_templates)
+        template, fields = rng.choice(_TITLE_TEMPLATES[cat])
         
-        # Fill in placeholders
-        title = title.replace("{topic}", random.choice(topics))
-        title = title.replace("{tech}", random.choice(techs))
-        title = title.replace("{alt_tech}", random.choice(techs))
-        title = title.replace("{genre}", random.choice(genres))
-        title = title.replace("{mood}", random.choice(moods))
-        title = title.replace("{activity}", random.choice(activities))
-        title = title.replace("{action}", random.choice(actions))
-        title = title.replace("{project}", random.choice(projects))
-        title = title.replace("{game}", random.choice(games))
-        title = title.replace("{time}", random.choice(["1 Hour", "30 Minutes", "2 Hours"]))
-        title = title.replace("{duration}", random.choice(["1 Hour Mix", "2 Hour Session"]))
-        title = title.replace("{year}", "2024")
+        # Draw only the placeholders this template actually uses
+        title = template.format_map({
+            field: rng.choice(_PLACEHOLDER_POOLS[field]) for field in fields
+        })
         
         video = {
-            "id": f"gen_{hashlib.md5(f'{i}{random.random()}'.encode()).hexdigest()[:10]}",
+            "id": "gen_" + id_hex[10 * i:10 * i + 10],
             "title": title,
-            "channel_title": random.choice(channels),
-            "duration_seconds": random.randint(300, 7200),
-            "view_count": random.randint(100000, 50000000),
+            "channel_title": rng.choice(_CHANNELS),
+            "duration_seconds": durations[i],
+            "view_count": views[i],
             "thumbnail_url": f"https://picsum.photos/seed/{i}/320/180",
             "is_short": False,
-            "published_at": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat() + "Z",
+            "published_at": dates[i],
             "category": cat,  # Add category for fast filtering
             "clickbait_score": 0.1,
-            "entertainment_score": 0.3 if cat in ["EDUCATION", "SCIENCE_TECH"] else 0.6,
+            "entertainment_score": _ENTERTAINMENT_SCORE.get(cat, 0.6),
         }
         generated.append(video)
     
-    # Reset random seed
-    random.seed()
-    
     return generated
@@ -1,14 +1,113 @@
 """Filter Engine for enforcing focus mode rules."""
-from typing import Dict, Any
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
 from app.models.focus_mode import FocusMode
 from app.schemas.video import VideoClassification
 
 
+@lru_cache(maxsize=256)
+def _compile_keywords(keywords: Tuple[str, ...]) -> Tuple["re.Pattern[str]", Dict[str, str]]:
+    """Compile a blocked-keyword list into one alternation, shared by modes with the same list.
+    
+    Returns the pattern and a map from each lowercased keyword back to the
+    keyword as the user wrote it, for the block reason.
+    """
+    originals: Dict[str, str] = {}
+    for keyword in keywords:
+        originals.setdefault(keyword.lower(), keyword)
+    # Longest first, so a phrase wins over a keyword that is its prefix
+    alternatives = sorted(originals, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, alternatives))), originals
+
+
+@lru_cache(maxsize=4096)
+def _find_keyword(pattern: "re.Pattern[str]", title_lower: str, description_lower: str) -> Optional[str]:
+    """First blocked keyword (lowercased) in a video's lowercased title or description.
+    
+    Feed pages are cached and shared, so the same title and description
+    objects come back request after request; their hashes are cached on the
+    strings, which makes a repeat verdict a single dict probe instead of a
+    fresh scan.
+    """
+    match = pattern.search(title_lower) or pattern.search(description_lower)
+    return match.group() if match else None
+
+
+# Block reason codes; the user-facing text is only built by format_reason
+ALLOWED = 0
+REASON_SHORT = 1
+REASON_TOO_SHORT = 2
+REASON_CLICKBAIT = 3
+REASON_ENTERTAINMENT = 4
+REASON_BLOCKED_CATEGORY = 5
+REASON_CATEGORY_NOT_ALLOWED = 6
+REASON_LANGUAGE = 7
+REASON_KEYWORD = 8
+
+
+def format_reason(code: int, context: Any = None) -> str:
+    """User-facing text for a block reason code and its context value."""
+    if code == REASON_SHORT:
+        return "Shorts are blocked in this focus mode"
+    if code == REASON_TOO_SHORT:
+        return f"Video too short (minimum {context // 60} minutes required)"
+    if code == REASON_CLICKBAIT:
+        return f"Video detected as clickbait (score: {context:.2f})"
+    if code == REASON_ENTERTAINMENT:
+        return f"Video too entertaining for this focus mode (score: {context:.2f})"
+    if code == REASON_BLOCKED_CATEGORY:
+        return f"Category '{context}' is blocked in this focus mode"
+    if code == REASON_CATEGORY_NOT_ALLOWED:
+        return f"Category '{context}' is not allowed in this focus mode"
+    if code == REASON_LANGUAGE:
+        return f"Language '{context}' is not allowed in this focus mode"
+    if code == REASON_KEYWORD:
+        return f"Video contains blocked keyword: '{context}'"
+    raise ValueError(f"Unknown block reason code: {code}")
+
+
 class FilterEngine:
     """Hard filtering engine based on focus mode configuration."""
     
     def __init__(self, mode: FocusMode):
         self.mode = mode
+        
+        # List rules as sets, for constant-time membership tests
+        self._allowed_cats = frozenset(mode.allowed_categories or ())
+        self._blocked_cats = frozenset(mode.blocked_categories or ())
+        self._allowed_langs = frozenset(mode.allowed_languages or ())
+        
+        # Every blocked keyword matched in one pass over each text
+        self._keyword_re: Optional["re.Pattern[str]"] = None
+        self._keywords: Dict[str, str] = {}
+        if mode.blocked_keywords:
+            self._keyword_re, self._keywords = _compile_keywords(tuple(mode.blocked_keywords))
+        
+        self._summary: Optional[Dict[str, Any]] = None
+    
+    def compile_fast_predicate(self) -> Callable[[Dict[str, Any]], bool]:
+        """Build a predicate for videos that already carry a category (demo data).
+        
+        Only the category, duration and Shorts rules apply. The mode's rules
+        are captured as closure locals so the per-video test does no
+        attribute lookups.
+        """
+        allowed = self._allowed_cats
+        blocked = self._blocked_cats
+        min_duration = self.mode.min_duration_seconds
+        block_shorts = self.mode.block_shorts
+        
+        def predicate(video: Dict[str, Any]) -> bool:
+            category = video.get("category", "ENTERTAINMENT")
+            return (
+                (not allowed or category in allowed)
+                and category not in blocked
+                and video.get("duration_seconds", 0) >= min_duration
+                and not (block_shorts and video.get("is_short", False))
+            )
+        
+        return predicate
     
     def check_video(
         self,
@@ -24,85 +123,127 @@ class FilterEngine:
                 "reason": str (if blocked)
             }
         """
+        blocked = self._block_reason(video, classification)
+        if blocked is None:
+            return {"allowed": True}
+        return {"allowed": False, "reason": format_reason(*blocked)}
+    
+    def _block_reason(
+        self,
+        video: Dict[str, Any],
+        classification: VideoClassification
+    ) -> Optional[Tuple[int, Any]]:
+        """First rule the video breaks, as (reason code, context), or None.
+        
+        The cheap scalar rules run first and the keyword scan last, so most
+        rejected videos never reach the expensive steps.
+        """
         # Step 1: Check if video is a Short
         if self.mode.block_shorts and video.get("is_short", False):
-            return {
-                "allowed": False,
-                "reason": "Shorts are blocked in this focus mode"
-            }
+            return REASON_SHORT, None
         
         # Step 2: Duration check
         duration = video.get("duration_seconds", 0)
         if duration < self.mode.min_duration_seconds:
-            return {
-                "allowed": False,
-                "reason": f"Video too short (minimum {self.mode.min_duration_seconds // 60} minutes required)"
-            }
+            return REASON_TOO_SHORT, self.mode.min_duration_seconds
         
-        # Step 3: Category check
+        # Step 3: Clickbait score check
+        if classification.clickbait_score > self.mode.max_clickbait_score:
+            return REASON_CLICKBAIT, classification.clickbait_score
+        
+        # Step 4: Entertainment score check
+        if classification.entertainment_score > self.mode.max_entertainment_score:
+            return REASON_ENTERTAINMENT, classification.entertainment_score
+        
+        # Step 5: Category check
         category = classification.category
         
         # Check blocked categories
-        if self.mode.blocked_categories:
-            if category in self.mode.blocked_categories:
-                return {
-                    "allowed": False,
-                    "reason": f"Category '{category}' is blocked in this focus mode"
-                }
+        if self._blocked_cats:
+            if category in self._blocked_cats:
+                return REASON_BLOCKED_CATEGORY, category
         
         # Check allowed categories (if specified, only these are allowed)
-        if self.mode.allowed_categories:
-            if category not in self.mode.allowed_categories:
-                return {
-                    "allowed": False,
-                    "reason": f"Category '{category}' is not allowed in this focus mode"
-                }
-        
-        # Step 4: Language check
-        if self.mode.allowed_languages:
-            video_lang = video.get("language", "")
-            if video_lang and video_lang not in self.mode.allowed_languages:
-                return {
-                    "allowed": False,
-                    "reason": f"Language '{video_lang}' is not allowed in this focus mode"
-                }
-        
-        # Step 5: Clickbait score check
-        if classification.clickbait_score > self.mode.max_clickbait_score:
-            return {
-                "allowed": False,
-                "reason": f"Video detected as clickbait (score: {classification.clickbait_score:.2f})"
-            }
+        if self._allowed_cats:
+            if category not in self._allowed_cats:
+                return REASON_CATEGORY_NOT_ALLOWED, category
         
-        # Step 6: Entertainment score check
-        if classification.entertainment_score > self.mode.max_entertainment_score:
-            return {
-                "allowed": False,
-                "reason": f"Video too entertaining for this focus mode (score: {classification.entertainment_score:.2f})"
-            }
+        # Step 6: Language check
+        if self._allowed_langs:
+            video_lang = video.get("language", "")
+            if video_lang and video_lang not in self._allowed_langs:
+                return REASON_LANGUAGE, video_lang
         
         # Step 7: Blocked keywords check
-        if self.mode.blocked_keywords:
-            title_lower = video.get("title", "").lower()
-            description_lower = video.get("description", "").lower()
-            
-            for keyword in self.mode.blocked_keywords:
-                keyword_lower = keyword.lower()
-                if keyword_lower in title_lower or keyword_lower in description_lower:
-                    return {
-                        "allowed": False,
-                        "reason": f"Video contains blocked keyword: '{keyword}'"
-                    }
+        if self._keyword_re is not None:
+            # YouTube videos arrive with the lowercase forms already computed
+            title_lower = video.get("title_lower")
+            if title_lower is None:
+                title_lower = video.get("title", "").lower()
+            description_lower = video.get("description_lower")
+            if description_lower is None:
+                description_lower = video.get("description", "").lower()
+            keyword = _find_keyword(self._keyword_re, title_lower, description_lower)
+            if keyword is not None:
+                return REASON_KEYWORD, self._keywords[keyword]
         
         # Step 8: Trending check
         # Note: We'd need to mark videos as trending from the API
         # For now, this is handled at the feed level
         
         # All checks passed
-        return {"allowed": True}
+        return None
+    
+    def check_batch(
+        self,
+        videos: Sequence[Dict[str, Any]],
+        classifications: Sequence[VideoClassification]
+    ) -> List[int]:
+        """Check a page of videos, returning one reason code per video (ALLOWED if it passes).
+        
+        The mode's scalar and category rules are read once for the whole page
+        and applied as a single pass/fail test per video. Only videos that fail
+        it, or that still need the language and keyword rules, go through the
+        full rule walk. No reason text is built; see format_reason.
+        """
+        mode = self.mode
+        block_shorts = mode.block_shorts
+        min_duration = mode.min_duration_seconds
+        max_clickbait = mode.max_clickbait_score
+        max_entertainment = mode.max_entertainment_score
+        allowed = self._allowed_cats
+        blocked = self._blocked_cats
+        needs_full_check = bool(self._allowed_langs) or self._keyword_re is not None
+        
+        codes = []
+        for video, classification in zip(videos, classifications):
+            category = classification.category
+            passes = (
+                not (block_shorts and video.get("is_short", False))
+                and video.get("duration_seconds", 0) >= min_duration
+                and classification.clickbait_score <= max_clickbait
+                and classification.entertainment_score <= max_entertainment
+                and category not in blocked
+                and (not allowed or category in allowed)
+            )
+            if passes and not needs_full_check:
+                codes.append(ALLOWED)
+            else:
+                block_reason = self._block_reason(video, classification)
+                codes.append(ALLOWED if block_reason is None else block_reason[0])
+        return codes
     
     def get_filter_summary(self) -> Dict[str, Any]:
-        """Get a summary of active filters for display."""
+        """Get a summary of active filters for display.
+        
+        Built once per engine and shared by later calls; treat it as read-only.
+        """
+        if self._summary is None:
+            self._summary = self._build_summary()
+        return self._summary
+    
+    def _build_summary(self) -> Dict[str, Any]:
+        """Collect the mode's filter settings for display."""
         return {
             "mode_name": self.mode.name,
             "block_shorts": self.mode.block_shorts,
@@ -113,7 +254,7 @@ class FilterEngine:
             "allowed_categories": self.mode.allowed_categories,
             "blocked_categories": self.mode.blocked_categories,
             "allowed_languages": self.mode.allowed_languages,
-            "blocked_keywords_count": len(self.mode.blocked_keywords or []),
+            "blocked_keywords_count": len(self.mode.blocked_keywords or ()),
             "daily_time_limit_minutes": self.mode.daily_time_limit_minutes,
             "is_locked": self.mode.is_locked,
         }
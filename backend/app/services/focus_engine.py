@@ -1,13 +1,21 @@
 """Focus Engine for managing focus modes and sessions."""
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, update, func
 
 from app.models.user import User
 from app.models.focus_mode import FocusMode
 from app.models.watch_history import WatchHistory
 
+# Today's watch total only moves as fast as the user watches, so reuse it briefly
+TIME_USED_TTL_SECONDS = 30
+TIME_USED_CACHE_MAX_SIZE = 10_000
+_time_used: "OrderedDict[uuid.UUID, Tuple[datetime, int, float]]" = OrderedDict()
+
 
 class FocusEngine:
     """Engine for managing focus modes and enforcing time limits."""
@@ -35,28 +43,30 @@ class FocusEngine:
                 f"Cannot change mode: '{locked.name}' is locked until {locked.lock_until}"
             )
         
-        # Deactivate all modes
+        try:
+            mode_uuid = uuid.UUID(str(mode_id))
+        except ValueError:
+            raise ValueError("Focus mode not found")
+        
+        # Activate the requested mode; it comes back unlocked like all the others
         result = await self.db.execute(
-            select(FocusMode).where(FocusMode.user_id == self.user.id)
+            update(FocusMode)
+            .where(FocusMode.id == mode_uuid, FocusMode.user_id == self.user.id)
+            .values(is_active=True, is_locked=False, lock_until=None)
+            .returning(FocusMode)
         )
-        all_modes = result.scalars().all()
-        
-        for mode in all_modes:
-            mode.is_active = False
-            mode.is_locked = False
-            mode.lock_until = None
-        
-        # Activate requested mode
-        target_mode = None
-        for mode in all_modes:
-            if str(mode.id) == str(mode_id):
-                mode.is_active = True
-                target_mode = mode
-                break
+        target_mode = result.scalar_one_or_none()
         
         if not target_mode:
             raise ValueError("Focus mode not found")
         
+        # Deactivate and unlock every other mode in one statement
+        await self.db.execute(
+            update(FocusMode)
+            .where(FocusMode.user_id == self.user.id, FocusMode.id != mode_uuid)
+            .values(is_active=False, is_locked=False, lock_until=None)
+        )
+        
         await self.db.commit()
         return target_mode
     
@@ -102,25 +112,19 @@ class FocusEngine:
         return mode
     
     async def _get_locked_mode(self) -> Optional[FocusMode]:
-        """Check if any mode is currently locked."""
+        """Get the mode whose lock is still running, if any.
+        
+        Expired locks are simply not matched; activate_mode clears them along
+        with every other lock, so this read never has to write.
+        """
         result = await self.db.execute(
             select(FocusMode).where(
                 FocusMode.user_id == self.user.id,
-                FocusMode.is_locked == True
-            )
+                FocusMode.is_locked == True,
+                FocusMode.lock_until > datetime.utcnow()
+            ).limit(1)
         )
-        mode = result.scalar_one_or_none()
-        
-        if mode and mode.lock_until:
-            if mode.lock_until > datetime.utcnow():
-                return mode
-            else:
-                # Lock expired, unlock it
-                mode.is_locked = False
-                mode.lock_until = None
-                await self.db.commit()
-        
-        return None
+        return result.scalar_one_or_none()
     
     async def check_time_limit(self, mode: FocusMode) -> dict:
         """Check if user has exceeded daily time limit."""
@@ -133,16 +137,7 @@ class FocusEngine:
                 "remaining_minutes": None
             }
         
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        result = await self.db.execute(
-            select(func.sum(WatchHistory.watch_duration_seconds))
-            .where(
-                WatchHistory.user_id == self.user.id,
-                WatchHistory.watched_at >= today_start
-            )
-        )
-        total_seconds = result.scalar() or 0
+        total_seconds = await self._watched_seconds_today()
         used_minutes = total_seconds // 60
         
         exceeded = used_minutes >= mode.daily_time_limit_minutes
@@ -156,6 +151,34 @@ class FocusEngine:
             "remaining_minutes": remaining
         }
     
+    async def _watched_seconds_today(self) -> int:
+        """Seconds watched since UTC midnight, read from the database at most once per TTL."""
+        # watched_at is naive UTC, so the day boundary comes from the app clock
+        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        user_id = self.user.id
+        now = time.monotonic()
+        
+        cached = _time_used.get(user_id)
+        if cached is not None:
+            day, total_seconds, cached_at = cached
+            if day == today_start and now - cached_at < TIME_USED_TTL_SECONDS:
+                return total_seconds
+            del _time_used[user_id]
+        
+        result = await self.db.execute(
+            select(func.coalesce(func.sum(WatchHistory.watch_duration_seconds), 0))
+            .where(
+                WatchHistory.user_id == user_id,
+                WatchHistory.watched_at >= today_start
+            )
+        )
+        total_seconds = result.scalar_one()
+        
+        _time_used[user_id] = (today_start, total_seconds, now)
+        if len(_time_used) > TIME_USED_CACHE_MAX_SIZE:
+            _time_used.popitem(last=False)
+        return total_seconds
+    
     async def get_session_stats(self) -> dict:
         """Get current session statistics."""
         mode = await self.get_active_mode()
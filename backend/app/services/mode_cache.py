@@ -0,0 +1,59 @@
+"""Short-lived cache of each user's active focus mode."""
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.focus_mode import FocusMode
+
+# Kept short: other worker processes only see a change once their entry expires
+ACTIVE_MODE_TTL_SECONDS = 30
+ACTIVE_MODE_CACHE_MAX_SIZE = 10_000
+_active_modes: "OrderedDict[uuid.UUID, Tuple[FocusMode, float]]" = OrderedDict()
+
+
+def _snapshot(mode: FocusMode) -> FocusMode:
+    """Copy a mode's columns into a transient object no session can expire."""
+    return FocusMode(**{
+        column.key: getattr(mode, column.key)
+        for column in FocusMode.__table__.columns
+    })
+
+
+async def get_active_mode_cached(user_id: uuid.UUID, db: AsyncSession) -> Optional[FocusMode]:
+    """Get the user's active focus mode, hitting the database at most once per TTL.
+    
+    The returned object is a detached read-only copy; load the mode
+    through the session when it needs to be modified.
+    """
+    now = time.monotonic()
+    cached = _active_modes.get(user_id)
+    if cached is not None:
+        mode, cached_at = cached
+        if now - cached_at < ACTIVE_MODE_TTL_SECONDS:
+            _active_modes.move_to_end(user_id)
+            return mode
+        del _active_modes[user_id]
+    
+    result = await db.execute(
+        select(FocusMode).where(
+            FocusMode.user_id == user_id,
+            FocusMode.is_active == True
+        )
+    )
+    mode = result.scalar_one_or_none()
+    if mode is None:
+        return None
+    
+    snapshot = _snapshot(mode)
+    _active_modes[user_id] = (snapshot, now)
+    if len(_active_modes) > ACTIVE_MODE_CACHE_MAX_SIZE:
+        _active_modes.popitem(last=False)
+    return snapshot
+
+
+def invalidate_active_mode(user_id: uuid.UUID) -> None:
+    """Drop the cached active mode after any of the user's modes change."""
+    _active_modes.pop(user_id, None)
@@ -1,14 +1,27 @@
 """Personalization service for learning user preferences."""
-from typing import Dict, List, Optional
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case
 
 from app.models.user import User
 from app.models.watch_history import WatchHistory
 from app.models.feedback import UserFeedback
 from app.models.content_cache import ContentCache
 
+# Preferences move slowly; watch and feedback writes drop the user's entry early
+PREFERENCES_TTL_SECONDS = 300
+PREFERENCES_CACHE_MAX_SIZE = 10_000
+_preferences: "OrderedDict[uuid.UUID, Tuple[Dict, float]]" = OrderedDict()
+
+
+def invalidate_preferences(user_id: uuid.UUID) -> None:
+    """Drop the user's cached preferences after new watch or feedback data."""
+    _preferences.pop(user_id, None)
+
 
 class PersonalizationService:
     """Service for learning and applying user preferences."""
@@ -16,8 +29,35 @@ class PersonalizationService:
     def __init__(self, db: AsyncSession, user: User):
         self.db = db
         self.user = user
+        self._prefs_cache: Optional[Dict] = None
     
     async def get_user_preferences(self) -> Dict:
+        """Get the user's preferences, analyzing their behavior at most once per TTL.
+        
+        The result is shared between callers and must be treated as read-only.
+        """
+        if self._prefs_cache is not None:
+            return self._prefs_cache
+        
+        user_id = self.user.id
+        now = time.monotonic()
+        cached = _preferences.get(user_id)
+        if cached is not None:
+            preferences, cached_at = cached
+            if now - cached_at < PREFERENCES_TTL_SECONDS:
+                _preferences.move_to_end(user_id)
+                self._prefs_cache = preferences
+                return preferences
+            del _preferences[user_id]
+        
+        preferences = await self._compute_preferences()
+        _preferences[user_id] = (preferences, now)
+        if len(_preferences) > PREFERENCES_CACHE_MAX_SIZE:
+            _preferences.popitem(last=False)
+        self._prefs_cache = preferences
+        return preferences
+    
+    async def _compute_preferences(self) -> Dict:
         """Analyze user behavior to determine preferences."""
         # Get watch history stats
         history_stats = await self._analyze_watch_history()
@@ -61,80 +101,110 @@ class PersonalizationService:
         return preferences
     
     async def _analyze_watch_history(self, days: int = 30) -> Dict:
-        """Analyze watch history patterns."""
+        """Analyze watch history patterns, from per-video counts and their cached metadata."""
         since = datetime.utcnow() - timedelta(days=days)
         
-        # Get watch history with content cache
-        result = await self.db.execute(
-            select(WatchHistory, ContentCache)
-            .join(ContentCache, WatchHistory.video_id == ContentCache.video_id, isouter=True)
+        # Per-video watch counts straight off the (user_id, watched_at) index
+        watched = (await self.db.execute(
+            select(
+                WatchHistory.video_id,
+                func.count().label("watched"),
+                func.sum(case((WatchHistory.completed, 1), else_=0)).label("completed"),
+                func.sum(case((WatchHistory.was_skipped, 1), else_=0)).label("skipped"),
+            )
             .where(
                 WatchHistory.user_id == self.user.id,
                 WatchHistory.watched_at >= since
             )
-        )
-        rows = result.all()
+            .group_by(WatchHistory.video_id)
+        )).all()
+        
+        # Category and duration for just those videos, from the covering index
+        content = {}
+        if watched:
+            content_rows = await self.db.execute(
+                select(ContentCache.video_id, ContentCache.category, ContentCache.duration_seconds)
+                .where(ContentCache.video_id.in_([row.video_id for row in watched]))
+            )
+            content = {row.video_id: (row.category, row.duration_seconds) for row in content_rows}
         
         completed_by_category = {}
         skipped_by_category = {}
-        duration_preferences = []
-        
-        for watch, content in rows:
-            category = content.category if content else "UNKNOWN"
-            
-            if watch.completed:
-                completed_by_category[category] = completed_by_category.get(category, 0) + 1
-                if content:
-                    duration_preferences.append(content.duration_seconds)
-            
-            if watch.was_skipped:
-                skipped_by_category[category] = skipped_by_category.get(category, 0) + 1
+        duration_total = 0
+        duration_count = 0
+        total_videos = 0
+        
+        for row in watched:
+            total_videos += row.watched
+            cached = content.get(row.video_id)
+            # Watches of videos that were never classified count as UNKNOWN
+            category = cached[0] if cached is not None else "UNKNOWN"
+            if row.completed:
+                completed_by_category[category] = completed_by_category.get(category, 0) + row.completed
+                # Durations of completed videos we have metadata for
+                if cached is not None and cached[1] is not None:
+                    duration_total += cached[1] * row.completed
+                    duration_count += row.completed
+            if row.skipped:
+                skipped_by_category[category] = skipped_by_category.get(category, 0) + row.skipped
         
         return {
             "completed_by_category": completed_by_category,
             "skipped_by_category": skipped_by_category,
-            "avg_preferred_duration": sum(duration_preferences) / len(duration_preferences) if duration_preferences else 0,
-            "total_videos": len(rows)
+            "avg_preferred_duration": duration_total / duration_count if duration_count else 0,
+            "total_videos": total_videos
         }
     
     async def _analyze_feedback(self, days: int = 30) -> Dict:
-        """Analyze explicit user feedback."""
+        """Analyze explicit user feedback, grouped by category and type in the database."""
         since = datetime.utcnow() - timedelta(days=days)
         
         result = await self.db.execute(
-            select(UserFeedback, ContentCache)
+            select(
+                ContentCache.category,
+                UserFeedback.feedback_type,
+                func.count().label("count"),
+            )
+            .select_from(UserFeedback)
             .join(ContentCache, UserFeedback.video_id == ContentCache.video_id, isouter=True)
             .where(
                 UserFeedback.user_id == self.user.id,
                 UserFeedback.created_at >= since
             )
+            .group_by(ContentCache.category, UserFeedback.feedback_type)
         )
-        rows = result.all()
         
-        liked_categories = []
-        disliked_categories = []
+        liked_categories = set()
+        disliked_categories = set()
+        total_feedback = 0
         
-        for feedback, content in rows:
-            category = content.category if content else None
+        for category, feedback_type, count in result:
+            total_feedback += count
             
-            if feedback.feedback_type == "like" and category:
-                liked_categories.append(category)
-            elif feedback.feedback_type in ("dislike", "not_interested") and category:
-                disliked_categories.append(category)
+            if feedback_type == "like" and category:
+                liked_categories.add(category)
+            elif feedback_type in ("dislike", "not_interested") and category:
+                disliked_categories.add(category)
         
         return {
-            "liked_categories": list(set(liked_categories)),
-            "disliked_categories": list(set(disliked_categories)),
-            "total_feedback": len(rows)
+            "liked_categories": list(liked_categories),
+            "disliked_categories": list(disliked_categories),
+            "total_feedback": total_feedback
         }
     
     async def adjust_scores(
         self,
         video_id: str,
-        classification: Dict
+        classification: Dict,
+        preferences: Optional[Dict] = None
     ) -> Dict:
-        """Adjust AI scores based on learned preferences."""
-        preferences = await self.get_user_preferences()
+        """Adjust AI scores based on learned preferences.
+        
+        Callers adjusting many videos should fetch get_user_preferences() once
+        and pass it in, rather than have every call look it up.
+        """
+        if preferences is None:
+            preferences = await self.get_user_preferences()
         
         # Start with original scores
         adjusted = classification.copy()
@@ -158,37 +228,26 @@ class PersonalizationService:
         """Re-rank videos based on user preferences."""
         preferences = await self.get_user_preferences()
         
-        scored_videos = []
-        for video in videos:
-            score = 1.0
-            
-            category = video.get("category", "")
-            
-            # Boost preferred categories
-            if category in preferences.get("preferred_categories", []):
-                score += 0.5
-            
-            # Penalize avoided categories
-            if category in preferences.get("avoided_categories", []):
-                score -= 0.5
-            
-            # Factor in engagement scores
-            depth = video.get("depth_score", 0.5)
-            score += depth * 0.3
-            
-            clickbait = video.get("clickbait_score", 0)
-            score -= clickbait * 0.4
-            
-            scored_videos.append({
-                **video,
-                "personalization_score": score
-            })
-        
-        # Sort by personalization score
-        sorted_videos = sorted(
-            scored_videos,
-            key=lambda x: x["personalization_score"],
-            reverse=True
-        )
+        preferred = frozenset(preferences.get("preferred_categories", ()))
+        avoided = frozenset(preferences.get("avoided_categories", ()))
+        
+        # Category boost and penalty folded into one base score per category
+        base_scores = {
+            category: 1.0 + (category in preferred) * 0.5 - (category in avoided) * 0.5
+            for category in preferred | avoided
+        }
         
-        return sorted_videos
+        # Scores in one flat list: one dict lookup plus the engagement terms per video
+        scores = [
+            base_scores.get(video.get("category", ""), 1.0)
+            + video.get("depth_score", 0.5) * 0.3
+            - video.get("clickbait_score", 0) * 0.4
+            for video in videos
+        ]
+        
+        # Sort indices by score, then build each output dict once, already in order
+        order = sorted(range(len(videos)), key=scores.__getitem__, reverse=True)
+        return [
+            {**videos[i], "personalization_score": scores[i]}
+            for i in order
+        ]
@@ -0,0 +1,113 @@
+"""Buffered writer that batches watch events into bulk inserts."""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, text
+
+from app.database import async_session_maker
+from app.models.watch_history import WatchHistory
+from app.services.personalization import invalidate_preferences
+
+logger = logging.getLogger(__name__)
+
+
+class WatchEventBuffer:
+    """Queue watch events in memory and write them in batches.
+    
+    Rows are flushed every `flush_interval` seconds, or sooner once
+    `batch_size` rows are waiting, so frequent watch pings cost one
+    INSERT/COMMIT per batch instead of one per event. Events still in
+    the queue when the process dies are lost.
+    """
+    
+    def __init__(self, flush_interval: float = 0.2, batch_size: int = 500):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def add(self, row: Dict[str, Any]) -> None:
+        """Queue a WatchHistory row (column name -> value) for writing."""
+        self._queue.put_nowait(row)
+    
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None:
+            # Fresh queue for the running event loop, carrying over any rows
+            # added before startup (or left by an earlier loop)
+            queue: asyncio.Queue = asyncio.Queue()
+            while not self._queue.empty():
+                queue.put_nowait(self._queue.get_nowait())
+            self._queue = queue
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the flush loop."""
+        if self._task is None:
+            return
+        self._queue.put_nowait(None)  # Sentinel: drain and exit
+        await self._task
+        self._task = None
+    
+    async def _run(self) -> None:
+        """Collect rows into batches and write them until stopped."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            row = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            
+            while True:
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    break
+                
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            
+            if batch:
+                await self._write(batch)
+    
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert a batch of rows in a single statement.
+        
+        If the batch fails, each row is retried on its own so one bad row
+        only loses itself, not every other user's events in the batch.
+        """
+        try:
+            await self._insert(rows)
+        except Exception:
+            if len(rows) == 1:
+                logger.exception("Failed to write watch event")
+                return
+            logger.warning("Batch of %d watch events failed; retrying rows individually", len(rows))
+            for row in rows:
+                try:
+                    await self._insert([row])
+                except Exception:
+                    logger.exception("Failed to write watch event for video %s", row.get("video_id"))
+    
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows in one transaction and invalidate their users' preferences."""
+        async with async_session_maker() as session:
+            # Analytics rows tolerate a small loss window on crash
+            await session.execute(text("SET LOCAL synchronous_commit TO OFF"))
+            await session.execute(insert(WatchHistory), rows)
+            await session.commit()
+        
+        # Only now do preference reads see these events, so drop cached
+        # aggregates here rather than when the events were queued
+        for user_id in {row["user_id"] for row in rows}:
+            invalidate_preferences(user_id)
+
+watch_event_buffer = WatchEventBuffer()
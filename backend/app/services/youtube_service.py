@@ -1,7 +1,10 @@
 """YouTube API service."""
+import asyncio
 import httpx
-import re
-from typing import Optional, Dict, List, Any
+import orjson
+import time
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Set, Tuple
 from datetime import datetime
 from youtube_transcript_api import YouTubeTranscriptApi
 
@@ -10,54 +13,131 @@ from app.config import get_settings
 settings = get_settings()
 
 
+# Seconds per unit, by the byte code of each ISO 8601 time designator (H, M, S)
+_DURATION_UNITS = {ord("H"): 3600, ord("M"): 60, ord("S"): 1}
+
+
+@lru_cache(maxsize=4096)
+def _parse_duration(duration: str) -> int:
+    """Parse ISO 8601 duration to seconds.
+    
+    Cached: YouTube durations repeat heavily across pages and re-fetches.
+    """
+    # PT1H2M3S -> 3723 seconds; a single scan over the bytes, no regex
+    if not duration.startswith("PT"):
+        return 0
+    
+    total = 0
+    number = 0
+    for byte in duration.encode("ascii", "replace")[2:]:
+        if 48 <= byte <= 57:
+            number = number * 10 + byte - 48
+        else:
+            unit = _DURATION_UNITS.get(byte)
+            if unit is None:
+                break
+            total += number * unit
+            number = 0
+    
+    return total
+
+
 class YouTubeService:
     """Service for interacting with YouTube Data API v3."""
     
     BASE_URL = "https://www.googleapis.com/youtube/v3"
     
+    # YouTube's videoDuration=long only returns videos over 20 minutes
+    LONG_VIDEO_SECONDS = 20 * 60
+    
+    # Thumbnail sizes, best first
+    THUMBNAIL_PRIORITY = ("maxres", "high", "medium", "default")
+    
+    # Title tag marking a Short; also matches "#shorts"
+    SHORTS_TAG = "#short"
+    
+    # Most ids the videos endpoint accepts in one request
+    MAX_IDS_PER_REQUEST = 50
+    
+    # Trending pages are identical for every user, so share them briefly
+    TRENDING_CACHE_TTL_SECONDS = 300
+    TRENDING_CACHE_MAX_SIZE = 256
+    
+    # Partial responses: only the fields _format_video reads
+    _SNIPPET_FIELDS = (
+        "snippet(title,description,channelId,channelTitle,thumbnails,publishedAt,"
+        "defaultLanguage,defaultAudioLanguage,tags,categoryId)"
+    )
+    _PAGE_FIELDS = "nextPageToken,pageInfo/totalResults"
+    VIDEO_FIELDS = (
+        f"items(id,{_SNIPPET_FIELDS},contentDetails/duration,"
+        "statistics(viewCount,likeCount,commentCount))"
+    )
+    SEARCH_FIELDS = f"items(id/videoId),{_PAGE_FIELDS}"
+    
+    # How long a single-video lookup waits for others to share its request
+    DETAILS_BATCH_WINDOW_SECONDS = 0.01
+    
+    # Search pages are shared by every user sending the same query
+    SEARCH_CACHE_TTL_SECONDS = 600
+    SEARCH_CACHE_MAX_SIZE = 1024
+    
+    # Video metadata changes slowly; repeat lookups skip the API and its quota
+    DETAILS_CACHE_TTL_SECONDS = 3600
+    DETAILS_CACHE_MAX_SIZE = 10_000
+    
     def __init__(self):
         self.api_key = settings.youtube_api_key
+        self._client: Optional[httpx.AsyncClient] = None
+        self._trending_cache: Dict[Tuple[int, Optional[str]], Tuple[Dict, float]] = {}
+        self._search_cache: Dict[Tuple, Tuple[Dict, float]] = {}
+        self._details_cache: Dict[str, Tuple[Dict, float]] = {}
+        # Single-video lookups waiting to go out together in the next videos request
+        self._details_batch: Dict[str, asyncio.Future] = {}
+        self._details_batch_full = asyncio.Event()
+        self._details_batch_tasks: Set[asyncio.Task] = set()
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client so requests reuse pooled connections."""
+        if self._client is None or self._client.is_closed:
+            # HTTP/2 multiplexes the search and details calls over one TLS connection
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=30,
+                ),
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
     
     async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict:
         """Make authenticated request to YouTube API."""
         params["key"] = self.api_key
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/{endpoint}",
-                params=params,
-                timeout=30.0
-            )
-            
-            if response.status_code != 200:
-                return {"error": response.json(), "items": []}
-            
-            return response.json()
-    
-    def _parse_duration(self, duration: str) -> int:
-        """Parse ISO 8601 duration to seconds."""
-        # PT1H2M3S -> 3723 seconds
-        pattern = re.compile(r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?')
-        match = pattern.match(duration)
-        
-        if not match:
-            return 0
+        response = await self.client.get(endpoint, params=params)
         
-        hours = int(match.group(1) or 0)
-        minutes = int(match.group(2) or 0)
-        seconds = int(match.group(3) or 0)
+        # orjson parses the raw bytes, skipping the decode to str
+        if response.status_code != 200:
+            return {"error": orjson.loads(response.content), "items": []}
         
-        return hours * 3600 + minutes * 60 + seconds
+        return orjson.loads(response.content)
     
-    def _is_short(self, duration_seconds: int, title: str) -> bool:
+    def _is_short(self, duration_seconds: int, title_lower: str) -> bool:
         """Determine if video is a YouTube Short."""
         # Shorts are typically 60 seconds or less
         if duration_seconds <= 60:
             return True
         # Also check for #shorts in title
-        if "#shorts" in title.lower() or "#short" in title.lower():
-            return True
-        return False
+        return self.SHORTS_TAG in title_lower
     
     def _format_video(self, item: Dict, details: Optional[Dict] = None) -> Dict:
         """Format video data into standard structure."""
@@ -65,46 +145,50 @@ class YouTubeService:
         statistics = details.get("statistics", {}) if details else {}
         content_details = details.get("contentDetails", {}) if details else {}
         
-        duration_seconds = self._parse_duration(
+        duration_seconds = _parse_duration(
             content_details.get("duration", "PT0S")
         )
         title = snippet.get("title", "")
+        description = snippet.get("description", "")
+        # Lowercased once here for the keyword filters, not on every check
+        title_lower = title.lower()
         
-        # Handle id being either a dict (from search) or string (from videos)
-        item_id = item.get("id", "")
-        if isinstance(item_id, dict):
-            video_id = item_id.get("videoId", "")
-        else:
-            video_id = item_id
+        video_id = item.get("id", "")
         
         # Get best thumbnail
         thumbnails = snippet.get("thumbnails", {})
-        thumbnail_url = (
-            thumbnails.get("maxres", {}).get("url") or
-            thumbnails.get("high", {}).get("url") or
-            thumbnails.get("medium", {}).get("url") or
-            thumbnails.get("default", {}).get("url")
-        )
+        thumbnail_url = None
+        for size in self.THUMBNAIL_PRIORITY:
+            thumbnail = thumbnails.get(size)
+            if thumbnail:
+                thumbnail_url = thumbnail.get("url")
+                if thumbnail_url:
+                    break
         
         # Parse published date
         published_at = None
-        if snippet.get("publishedAt"):
+        published_raw = snippet.get("publishedAt")
+        if published_raw:
+            # YouTube always sends UTC with a "Z" suffix, which fromisoformat
+            # only accepts from Python 3.11; swap just the last character
+            if published_raw[-1] == "Z":
+                published_raw = published_raw[:-1] + "+00:00"
             try:
-                published_at = datetime.fromisoformat(
-                    snippet["publishedAt"].replace("Z", "+00:00")
-                )
-            except:
+                published_at = datetime.fromisoformat(published_raw)
+            except ValueError:
                 pass
         
         return {
             "id": video_id,
             "title": title,
-            "description": snippet.get("description", ""),
+            "description": description,
+            "title_lower": title_lower,
+            "description_lower": description.lower(),
             "channel_id": snippet.get("channelId"),
             "channel_title": snippet.get("channelTitle"),
             "thumbnail_url": thumbnail_url,
             "duration_seconds": duration_seconds,
-            "is_short": self._is_short(duration_seconds, title),
+            "is_short": self._is_short(duration_seconds, title_lower),
             "language": snippet.get("defaultLanguage") or snippet.get("defaultAudioLanguage"),
             "tags": snippet.get("tags", []),
             "view_count": int(statistics.get("viewCount", 0)),
@@ -114,15 +198,44 @@ class YouTubeService:
             "category_id": snippet.get("categoryId"),
         }
     
+    def search_filters(self, min_duration_seconds: int) -> Dict[str, str]:
+        """Translate focus mode rules into search_videos filter arguments.
+        
+        Only rules YouTube can apply without dropping videos the mode would
+        allow are pushed down: minimum durations of over 20 minutes.
+        videoDuration=medium (4-20 min) would also exclude long videos, so
+        shorter minimums and block_shorts stay client-side. Categories stay
+        client-side too: the mode's categories come from our classifier, not
+        YouTube's videoCategoryId, so a tutorial uploaded as Science & Tech
+        can still be EDUCATION here.
+        """
+        filters = {}
+        if min_duration_seconds > self.LONG_VIDEO_SECONDS:
+            filters["video_duration"] = "long"
+        return filters
+    
     async def search_videos(
         self,
         query: str,
         max_results: int = 20,
-        page_token: Optional[str] = None
+        page_token: Optional[str] = None,
+        video_duration: Optional[str] = None,
+        category_id: Optional[str] = None
     ) -> Dict:
-        """Search for videos."""
+        """Search for videos, optionally filtered by duration and category.
+        
+        Result pages are cached for SEARCH_CACHE_TTL_SECONDS; feed searches
+        are built from category names, so many users send the same query.
+        Only pages whose search and details requests all succeeded are cached.
+        """
+        cache_key = (query, max_results, page_token, video_duration, category_id)
+        cached = self._search_cache.get(cache_key)
+        if cached and time.monotonic() - cached[1] < self.SEARCH_CACHE_TTL_SECONDS:
+            return cached[0]
+        
         params = {
             "part": "snippet",
+            "fields": self.SEARCH_FIELDS,
             "type": "video",
             "q": query,
             "maxResults": max_results,
@@ -132,6 +245,10 @@ class YouTubeService:
         
         if page_token:
             params["pageToken"] = page_token
+        if video_duration:
+            params["videoDuration"] = video_duration
+        if category_id:
+            params["videoCategoryId"] = category_id
         
         result = await self._make_request("search", params)
         
@@ -139,63 +256,196 @@ class YouTubeService:
             return result
         
         # Get video details for duration and stats
-        video_ids = [item["id"]["videoId"] for item in result.get("items", [])]
-        details = await self._get_videos_details(video_ids)
+        videos, details_error = await self._format_search_items(result.get("items", []))
+        if details_error is not None:
+            # Not cached: a partial page would be served to every user for the TTL
+            return {"error": details_error, "items": []}
         
-        videos = []
-        for item in result.get("items", []):
-            video_id = item["id"]["videoId"]
-            video_details = details.get(video_id, {})
-            videos.append(self._format_video(item, video_details))
-        
-        return {
+        page = {
             "items": videos,
             "next_page_token": result.get("nextPageToken"),
             "total_results": result.get("pageInfo", {}).get("totalResults")
         }
+        
+        self._search_cache.pop(cache_key, None)
+        self._search_cache[cache_key] = (page, time.monotonic())
+        if len(self._search_cache) > self.SEARCH_CACHE_MAX_SIZE:
+            # Dicts keep insertion order, so the first key is the oldest
+            del self._search_cache[next(iter(self._search_cache))]
+        
+        return page
     
-    async def _get_videos_details(self, video_ids: List[str]) -> Dict[str, Dict]:
-        """Get detailed info for multiple videos."""
-        if not video_ids:
-            return {}
+    async def _format_search_items(
+        self,
+        items: List[Dict]
+    ) -> Tuple[List[Dict], Optional[Dict]]:
+        """Format search results from their videos-endpoint details.
         
-        params = {
-            "part": "snippet,contentDetails,statistics",
-            "id": ",".join(video_ids)
-        }
+        Search only supplies the ids. The details carry the fuller snippet
+        (tags, language, category) and come from the shared details cache;
+        hits missing from a successful details response (deleted or private
+        videos) are dropped. Returns the videos and the details request
+        error, if any.
+        """
+        video_ids = [item["id"]["videoId"] for item in items]
+        details, error = await self._get_videos_details(video_ids)
         
-        result = await self._make_request("videos", params)
+        format_video = self._format_video
+        videos = []
+        for video_id in video_ids:
+            video_details = details.get(video_id)
+            if video_details is not None:
+                videos.append(format_video(
+                    {"id": video_id, "snippet": video_details.get("snippet", {})},
+                    video_details
+                ))
+        return videos, error
+    
+    async def _get_videos_details(
+        self,
+        video_ids: List[str]
+    ) -> Tuple[Dict[str, Dict], Optional[Dict]]:
+        """Get detailed info for multiple videos.
+        
+        Items fetched within DETAILS_CACHE_TTL_SECONDS come from the cache;
+        only the rest are requested. The videos endpoint takes at most
+        MAX_IDS_PER_REQUEST ids, so longer lists are split and the requests
+        run concurrently.
         
+        Returns the details found and the first request error, if any; ids
+        from a failed request are simply absent from the details.
+        """
+        if not video_ids:
+            return {}, None
+        
+        now = time.monotonic()
         details = {}
-        for item in result.get("items", []):
-            details[item["id"]] = item
+        missing = []
+        for video_id in video_ids:
+            cached = self._details_cache.get(video_id)
+            if cached and now - cached[1] < self.DETAILS_CACHE_TTL_SECONDS:
+                details[video_id] = cached[0]
+            else:
+                missing.append(video_id)
+        
+        if not missing:
+            return details, None
+        
+        chunks = [
+            missing[i:i + self.MAX_IDS_PER_REQUEST]
+            for i in range(0, len(missing), self.MAX_IDS_PER_REQUEST)
+        ]
+        results = await asyncio.gather(*(
+            self._make_request("videos", {
+                "part": "snippet,contentDetails,statistics",
+                "fields": self.VIDEO_FIELDS,
+                "id": ",".join(chunk)
+            })
+            for chunk in chunks
+        ))
         
-        return details
+        error = None
+        fetched_at = time.monotonic()
+        for result in results:
+            if "error" in result:
+                error = error or result["error"]
+                continue
+            for item in result.get("items", []):
+                video_id = item["id"]
+                details[video_id] = item
+                # Re-inserted so the dict stays ordered oldest first
+                self._details_cache.pop(video_id, None)
+                self._details_cache[video_id] = (item, fetched_at)
+        
+        while len(self._details_cache) > self.DETAILS_CACHE_MAX_SIZE:
+            del self._details_cache[next(iter(self._details_cache))]
+        
+        return details, error
     
     async def get_video_details(self, video_id: str) -> Optional[Dict]:
         """Get detailed info for a single video."""
-        params = {
-            "part": "snippet,contentDetails,statistics",
-            "id": video_id
-        }
-        
-        result = await self._make_request("videos", params)
-        
-        items = result.get("items", [])
-        if not items:
+        cached = self._details_cache.get(video_id)
+        if cached and time.monotonic() - cached[1] < self.DETAILS_CACHE_TTL_SECONDS:
+            item = cached[0]
+        else:
+            item = await self._get_batched_details(video_id)
+        if item is None:
             return None
         
-        item = items[0]
         return self._format_video({"id": video_id, "snippet": item.get("snippet", {})}, item)
     
+    async def _get_batched_details(self, video_id: str) -> Optional[Dict]:
+        """Fetch one video's details together with concurrent lookups.
+        
+        Ids arriving within DETAILS_BATCH_WINDOW_SECONDS of the first, up to
+        MAX_IDS_PER_REQUEST, are sent as a single videos request.
+        """
+        batch = self._details_batch
+        future = batch.get(video_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            batch[video_id] = future
+            if len(batch) == 1:
+                task = asyncio.create_task(
+                    self._send_details_batch(batch, self._details_batch_full)
+                )
+                self._details_batch_tasks.add(task)
+                task.add_done_callback(self._details_batch_tasks.discard)
+            if len(batch) >= self.MAX_IDS_PER_REQUEST:
+                # Send now; later ids start a new batch
+                self._details_batch_full.set()
+                self._details_batch = {}
+                self._details_batch_full = asyncio.Event()
+        
+        # Shielded: one caller giving up must not cancel the others sharing the id
+        return await asyncio.shield(future)
+    
+    async def _send_details_batch(
+        self,
+        batch: Dict[str, asyncio.Future],
+        full: asyncio.Event
+    ):
+        """Wait out the batch window, then resolve every lookup from one request."""
+        try:
+            await asyncio.wait_for(full.wait(), self.DETAILS_BATCH_WINDOW_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        
+        if self._details_batch is batch:
+            self._details_batch = {}
+            self._details_batch_full = asyncio.Event()
+        
+        try:
+            # A failed request leaves its ids unresolved, as not found
+            details, _ = await self._get_videos_details(list(batch))
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        
+        for video_id, future in batch.items():
+            if not future.done():
+                future.set_result(details.get(video_id))
+    
     async def get_recommended_videos(
         self,
         max_results: int = 20,
         page_token: Optional[str] = None
     ) -> Dict:
-        """Get recommended/popular videos (uses trending as proxy)."""
+        """Get recommended/popular videos (uses trending as proxy).
+        
+        Pages are cached per (max_results, page_token) for
+        TRENDING_CACHE_TTL_SECONDS since the chart is not personalized.
+        """
+        cache_key = (max_results, page_token)
+        cached = self._trending_cache.get(cache_key)
+        if cached and time.monotonic() - cached[1] < self.TRENDING_CACHE_TTL_SECONDS:
+            return cached[0]
+        
         params = {
             "part": "snippet,contentDetails,statistics",
+            "fields": f"{self.VIDEO_FIELDS},{self._PAGE_FIELDS}",
             "chart": "mostPopular",
             "regionCode": "US",
             "maxResults": max_results,
@@ -213,16 +463,25 @@ class YouTubeService:
                 item
             ))
         
-        return {
+        page = {
             "items": videos,
             "next_page_token": result.get("nextPageToken"),
             "total_results": result.get("pageInfo", {}).get("totalResults")
         }
+        
+        if "error" not in result:
+            self._trending_cache[cache_key] = (page, time.monotonic())
+            if len(self._trending_cache) > self.TRENDING_CACHE_MAX_SIZE:
+                # Dicts keep insertion order, so the first key is the oldest
+                del self._trending_cache[next(iter(self._trending_cache))]
+        
+        return page
     
     async def get_transcript(self, video_id: str) -> Optional[str]:
         """Get video transcript/captions."""
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
+            # The library fetches with blocking requests; keep it off the event loop
+            transcript_list = await asyncio.to_thread(YouTubeTranscriptApi.get_transcript, video_id)
             return " ".join([t["text"] for t in transcript_list])
         except Exception:
             # Transcript not available
@@ -237,6 +496,7 @@ class YouTubeService:
         """Get videos from a specific channel."""
         params = {
             "part": "snippet",
+            "fields": self.SEARCH_FIELDS,
             "channelId": channel_id,
             "type": "video",
             "order": "date",
@@ -248,16 +508,21 @@ class YouTubeService:
         
         result = await self._make_request("search", params)
         
-        video_ids = [item["id"]["videoId"] for item in result.get("items", [])]
-        details = await self._get_videos_details(video_ids)
+        if "error" in result:
+            return result
         
-        videos = []
-        for item in result.get("items", []):
-            video_id = item["id"]["videoId"]
-            videos.append(self._format_video(item, details.get(video_id, {})))
+        videos, error = await self._format_search_items(result.get("items", []))
+        if error is not None:
+            return {"error": error, "items": []}
         
         return {
             "items": videos,
             "next_page_token": result.get("nextPageToken"),
             "total_results": result.get("pageInfo", {}).get("totalResults")
         }
+
+
+@lru_cache()
+def get_youtube_service() -> YouTubeService:
+    """Get the shared YouTubeService instance."""
+    return YouTubeService()
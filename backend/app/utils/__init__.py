@@ -5,22 +5,19 @@ def format_duration(seconds: int) -> str:
     """Format seconds into human-readable duration."""
     if seconds < 60:
         return f"{seconds}s"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
-        if remaining_seconds:
-            return f"{minutes}m {remaining_seconds}s"
-        return f"{minutes}m"
-    else:
-        hours = seconds // 3600
-        minutes = (seconds % 3600) // 60
-        if minutes:
-            return f"{hours}h {minutes}m"
-        return f"{hours}h"
+    hours, remainder = divmod(seconds, 3600)
+    minutes, remaining_seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes}m" if minutes else f"{hours}h"
+    return f"{minutes}m {remaining_seconds}s" if remaining_seconds else f"{minutes}m"
+
+
+_ELLIPSIS = "..."
 
 
 def truncate_text(text: str, max_length: int = 100) -> str:
     """Truncate text with ellipsis."""
+    # Short text is returned as-is, without slicing or copying
     if len(text) <= max_length:
         return text
-    return text[:max_length - 3] + "..."
+    return f"{text[:max_length - 3]}{_ELLIPSIS}"